@@ -1,49 +1,40 @@
+import os
+import sys
 from typing import Union, List, Tuple
 import pickle
 import numpy as np
 import numpy.linalg as linalg
 import numpy.random as random
+import scipy.linalg
+from collections import OrderedDict
 from numpy.linalg import LinAlgError
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import residual_norm, matrix_fingerprint, spawn_rngs, random_orthogonal
+
 
 class ParameterError(Exception):
     pass
 
 
-def random_matrix_Ab(m: int):
+def random_matrix_Ab(m: int, rng=None):
     """Funkcja tworząca zestaw składający się z macierzy A (m,m) i wektora b (m,)  zawierających losowe wartości
     Parameters:
     m(int): rozmiar macierzy
+    rng: ziarno albo np.random.Generator (np. z spawn_rngs); globalny stan np.random nie jest używany
     Results:
     (np.ndarray, np.ndarray): macierz o rozmiarze (m,m) i wektorem (m,)
                 Jeżeli dane wejściowe niepoprawne funkcja zwraca None
     """
     try:
-        a1 = np.random.rand(m, m)
-        a2 = np.random.rand(m)
+        rng = np.random.default_rng(rng)
+        a1 = rng.random((m, m))
+        a2 = rng.random(m)
     except(ValueError, TypeError):
         return None
     return a1, a2
 
 
-def residual_norm(A: np.ndarray, x: np.ndarray, b: np.ndarray):
-    """Funkcja obliczająca normę residuum dla równania postaci:
-    Ax = b
-
-      Parameters:
-      A: macierz A (m,m) zawierająca współczynniki równania
-      x: wektor x (m.) zawierający rozwiązania równania
-      b: wektor b (m,) zawierający współczynniki po prawej stronie równania
-
-      Results:
-      (float)- wartość normy residuom dla podanych parametrów"""
-    try:
-        rn = linalg.norm(b - A @ x)
-        return rn
-    except ValueError:
-        return None
-
-
 def log_sing_value(n: int, min_order: Union[int, float], max_order: Union[int, float]):
     """Funkcja generująca wektor wartości singularnych rozłożonych w skali logarytmiczne
     
@@ -116,3 +107,136 @@ def create_matrix_from_A(A: np.ndarray, sing_value: np.ndarray):
         return result
     except(ValueError, LinAlgError):
         return None
+
+
+def matrices_with_sing_values(k: int, sing_value: np.ndarray, seed=None):
+    """Funkcja generująca k macierzy (m,m) o zadanych wartościach singularnych:
+    A_i = U_i diag(sing_value_i) V_i^T, gdzie U_i, V_i to losowe macierze ortogonalne
+    (random_orthogonal), więc nie jest potrzebny rozkład SVD losowej macierzy jak
+    w create_matrix_from_A
+
+        Parameters:
+        k(int): liczba macierzy, k>0
+        sing_value(np.ndarray): wektor wartości singularnych (m,) wspólny dla wszystkich
+                                macierzy albo macierz (k,m) - osobny wektor dla każdej
+        seed: ziarno albo np.random.Generator, dla powtarzalności wyników
+
+        Results:
+        np.ndarray: stos macierzy (k,m,m)
+                Jeżeli dane wejściowe niepoprawne funkcja zwraca None"""
+    try:
+        if not isinstance(k, int) or k <= 0 or not isinstance(sing_value, np.ndarray):
+            raise ValueError
+        if sing_value.ndim not in (1, 2) or (sing_value.ndim == 2 and sing_value.shape[0] != k):
+            raise ValueError
+        rng = np.random.default_rng(seed)
+        m = sing_value.shape[-1]
+        u = random_orthogonal(k, m, rng)
+        v = random_orthogonal(k, m, rng)
+        s = np.broadcast_to(sing_value, (k, m))
+        return (u * s[:, np.newaxis, :]) @ np.swapaxes(v, 1, 2)
+    except (ValueError, TypeError):
+        return None
+
+
+class FactorizationCache:
+    """Pamięć podręczna rozkładów LU / Cholesky'ego / QR macierzy, z usuwaniem najdawniej
+    używanych (LRU) po przekroczeniu liczby wpisów max_entries albo rozmiaru max_bytes.
+
+        Parameters:
+        max_entries(int): maksymalna liczba zapamiętanych rozkładów
+        max_bytes(int): maksymalny łączny rozmiar zapamiętanych rozkładów w bajtach"""
+
+    def __init__(self, max_entries: int = 16, max_bytes: int = 2 ** 30):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, A: np.ndarray, method: str = 'lu', key=None):
+        """Zwraca rozkład macierzy A metodą method, licząc go tylko przy pierwszym użyciu.
+        Macierz jest rozpoznawana po matrix_fingerprint, chyba że podano własny klucz key."""
+        key = (matrix_fingerprint(A) if key is None else key, method)
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        self.misses += 1
+        factor = factorize(A, method)
+        size = sum(part.nbytes for part in factor if isinstance(part, np.ndarray))
+        if size <= self.max_bytes:
+            self._entries[key] = factor
+            self.nbytes += size
+            while len(self._entries) > self.max_entries or self.nbytes > self.max_bytes:
+                _, old = self._entries.popitem(last=False)
+                self.nbytes -= sum(part.nbytes for part in old if isinstance(part, np.ndarray))
+        return factor
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+
+factorization_cache = FactorizationCache()
+
+
+def factorize(A: np.ndarray, method: str = 'lu'):
+    """Funkcja wyznaczająca rozkład macierzy A (m,m) potrzebny do rozwiązania układu Ax = b
+
+        Parameters:
+        A(np.ndarray): macierz (m,m)
+        method(str): 'lu', 'cholesky' (A symetryczna, dodatnio określona) albo 'qr'
+
+        Results:
+        tuple: rozkład macierzy w postaci zależnej od metody"""
+    if method == 'lu':
+        return scipy.linalg.lu_factor(A)
+    elif method == 'cholesky':
+        return scipy.linalg.cho_factor(A)
+    elif method == 'qr':
+        return tuple(linalg.qr(A))
+    raise ParameterError
+
+
+def solve(A: np.ndarray, b: np.ndarray, method: str = 'lu', cache: FactorizationCache = None,
+          return_residual: bool = False, key=None):
+    """Funkcja rozwiązująca układ Ax = b z wykorzystaniem zapamiętanego rozkładu macierzy A.
+    Pierwsze rozwiązanie dla danej macierzy kosztuje O(m^3), kolejne O(m^2).
+
+        Parameters:
+        A(np.ndarray): macierz (m,m)
+        b(np.ndarray): wektor (m,) albo macierz (m,k) k prawych stron
+        method(str): 'lu', 'cholesky' albo 'qr'
+        cache(FactorizationCache): pamięć rozkładów, domyślnie factorization_cache
+        return_residual(bool): czy zwrócić również normy residuum wszystkich kolumn
+        key: własny klucz macierzy w pamięci rozkładów - pomija liczenie skrótu O(m^2)
+
+        Results:
+        np.ndarray: rozwiązanie (m,) albo (m,k)
+        (np.ndarray, np.ndarray): dla return_residual=True dodatkowo normy residuum - liczba
+                                  albo wektor (k,) liczony jednym mnożeniem macierzy
+                Jeżeli dane wejściowe niepoprawne funkcja zwraca None"""
+    try:
+        if not isinstance(A, np.ndarray) or not isinstance(b, np.ndarray):
+            raise ValueError
+        if A.ndim != 2 or A.shape[0] != A.shape[1] or b.ndim not in (1, 2) or b.shape[0] != A.shape[0]:
+            raise ValueError
+        if cache is None:
+            cache = factorization_cache
+        factor = cache.get(A, method, key)
+        if method == 'lu':
+            x = scipy.linalg.lu_solve(factor, b)
+        elif method == 'cholesky':
+            x = scipy.linalg.cho_solve(factor, b)
+        else:
+            q, r = factor
+            x = scipy.linalg.solve_triangular(r, q.T @ b)
+        if return_residual:
+            if b.ndim == 1:
+                return x, residual_norm(A, x, b)
+            return x, residual_norm(A, x.T, b.T)
+        return x
+    except (ValueError, ParameterError, LinAlgError):
+        return None
@@ -61,3 +61,54 @@ def test_create_matrix_from_A(A:np.ndarray, sing_value:np.ndarray, result):
         assert main.create_matrix_from_A(A,sing_value) is None, 'Spodziewany wynik: {0}, aktualny {1}. Błedy wejścia.'.format(result, main.create_matrix_from_A(A,sing_value))
     else:    
         assert main.create_matrix_from_A(A,sing_value) == pytest.approx(result), 'Spodziewany wynik: {0}, aktualny {1}. Błedy wejścia.'.format(result, main.create_matrix_from_A(A,sing_value))
+
+
+@pytest.mark.parametrize("method", ['lu', 'cholesky', 'qr'])
+def test_solve_cached(method: str):
+    rng = np.random.default_rng(0)
+    M = rng.random((30, 30))
+    A = M @ M.T + 30 * np.eye(30)
+    B = rng.random((30, 4))
+    cache = main.FactorizationCache()
+    for b in (B[:, 0], B):
+        x = main.solve(A, b, method, cache=cache)
+        assert x == pytest.approx(np.linalg.solve(A, b)), 'Rozwiązanie różni się od np.linalg.solve dla metody {0}.'.format(method)
+    assert cache.misses == 1 and cache.hits == 1, 'Rozkład powinien zostać policzony raz. Trafienia: {0}, chybienia: {1}.'.format(cache.hits, cache.misses)
+
+
+@pytest.mark.parametrize("max_entries,max_bytes,expected_entries", [(2, 2 ** 30, 2), (16, 600, 1), (16, 2 ** 30, 3)])
+def test_factorization_cache_limits(max_entries: int, max_bytes: int, expected_entries: int):
+    cache = main.FactorizationCache(max_entries, max_bytes)
+    for k in range(3):
+        cache.get(np.eye(8) * (k + 1), 'lu')
+    assert len(cache._entries) == expected_entries, 'Spodziewana liczba wpisów: {0}, aktualna {1}.'.format(expected_entries, len(cache._entries))
+    assert cache.nbytes <= max_bytes, 'Przekroczony rozmiar pamięci podręcznej.'
+
+
+@pytest.mark.parametrize("chunk_size", [None, 1, 3])
+def test_residual_norm_batched(chunk_size: int):
+    rng = np.random.default_rng(0)
+    A, x, b = rng.random((5, 4, 4)), rng.random((5, 4)), rng.random((5, 4))
+    result = main.residual_norm(A, x, b, chunk_size)
+    expected_values = np.array([np.linalg.norm(b[k] - A[k] @ x[k]) for k in range(5)])
+    assert result == pytest.approx(expected_values), 'Spodziewany wynik: {0}, aktualny {1}.'.format(expected_values, result)
+    result = main.residual_norm(A[0], x, b, chunk_size)
+    expected_values = np.array([np.linalg.norm(b[k] - A[0] @ x[k]) for k in range(5)])
+    assert result == pytest.approx(expected_values), 'Spodziewany wynik: {0}, aktualny {1}.'.format(expected_values, result)
+
+
+@pytest.mark.parametrize("method", ['lu', 'qr'])
+def test_solve_return_residual(method: str):
+    rng = np.random.default_rng(1)
+    A, B = rng.random((20, 20)) + 20 * np.eye(20), rng.random((20, 4))
+    x, rn = main.solve(A, B, method, return_residual=True)
+    assert rn.shape == (4,) and np.all(rn < 1e-10), 'Niepoprawne normy residuum: {0}.'.format(rn)
+
+
+@pytest.mark.parametrize("k,sing_value", [(3, np.array([3.0, 2.0, 1.0])), (2, np.array([[5.0, 1.0, 0.1, 0.01], [1.0, 1.0, 1.0, 1.0]]))])
+def test_matrices_with_sing_values(k: int, sing_value: np.ndarray):
+    A = main.matrices_with_sing_values(k, sing_value, seed=0)
+    assert A.shape == (k, sing_value.shape[-1], sing_value.shape[-1]), 'Niepoprawny kształt wyniku: {0}.'.format(A.shape)
+    expected_s = np.sort(np.broadcast_to(sing_value, (k, sing_value.shape[-1])), axis=1)[:, ::-1]
+    assert np.linalg.svd(A, compute_uv=False) == pytest.approx(expected_s), 'Niepoprawne wartości singularne.'
+    assert main.matrices_with_sing_values(k, sing_value, seed=0) == pytest.approx(A), 'Wynik dla tego samego ziarna powinien być powtarzalny.'
@@ -1,3 +1,5 @@
+import os
+import sys
 import numpy as np
 import scipy as sp
 from scipy import linalg
@@ -6,13 +8,98 @@ import pickle
 
 from typing import Union, List, Tuple
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import residual_norm
 
-def spare_matrix_Abt(m: int, n: int):
+
+class VandermondeMatrix:
+    """Macierz Vandermonde'a A (m,n), A[i, j] = t_i^j (kolumny jak w spare_matrix_Abt),
+    przechowywana wyłącznie jako wektor węzłów t. Mnożenia A x i A^T y kosztują O(mn) czasu
+    i O(m) pamięci, a układ kwadratowy rozwiązywany jest algorytmem Björcka-Pereyry w O(n^2).
+
+    Parameters:
+    t(np.ndarray): węzły (m,)
+    n(int): liczba kolumn
+    """
+
+    def __init__(self, t: np.ndarray, n: int):
+        t = np.asarray(t, dtype=float)
+        if t.ndim != 1 or not isinstance(n, int) or n < 1:
+            raise ValueError
+        self.t = t
+        self.n = n
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.t.shape[0], self.n
+
+    @property
+    def ndim(self) -> int:
+        return 2
+
+    def toarray(self) -> np.ndarray:
+        """Pełna macierz (m,n)"""
+        return np.vander(self.t, self.n, increasing=True)
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        """A x schematem Hornera; x (n,) albo (n,k)"""
+        x = np.asarray(x)
+        if x.shape[0] != self.n:
+            raise ValueError
+        t = self.t.reshape((-1,) + (1,) * (x.ndim - 1))
+        y = np.broadcast_to(x[-1], (len(self.t),) + x.shape[1:]).astype(np.result_type(x, t))
+        for c in x[-2::-1]:
+            y = y * t + c
+        return y
+
+    def rmatvec(self, y: np.ndarray) -> np.ndarray:
+        """A^T y; y (m,) albo (m,k)"""
+        y = np.asarray(y)
+        if y.shape[0] != len(self.t):
+            raise ValueError
+        t = self.t.reshape((-1,) + (1,) * (y.ndim - 1))
+        out = np.empty((self.n,) + y.shape[1:], dtype=np.result_type(y, t))
+        p = y.astype(out.dtype)
+        for j in range(self.n):
+            out[j] = p.sum(axis=0)
+            p = p * t
+        return out
+
+    def gram(self) -> np.ndarray:
+        """A^T A (n,n) - macierz Hankela sum potęg węzłów, liczona w O(mn)"""
+        sums = np.empty(2 * self.n - 1)
+        p = np.ones_like(self.t)
+        for j in range(2 * self.n - 1):
+            sums[j] = p.sum()
+            p = p * self.t
+        return linalg.hankel(sums[:self.n], sums[self.n - 1:])
+
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        """Rozwiązanie układu kwadratowego A x = b (m = n, węzły różne) algorytmem Björcka-Pereyry"""
+        if self.shape[0] != self.n or b.shape[0] != self.n:
+            raise ValueError
+        t = self.t.reshape((-1,) + (1,) * (np.ndim(b) - 1))
+        x = np.array(b, dtype=np.result_type(b, t))
+        n = self.n
+        # ilorazy różnicowe Newtona
+        for k in range(n - 1):
+            x[k + 1:] = (x[k + 1:] - x[k:n - 1]) / (t[k + 1:] - t[:n - k - 1])
+        # zamiana postaci Newtona na współczynniki jednomianów
+        for k in range(n - 2, -1, -1):
+            x[k:n - 1] -= t[k] * x[k + 1:]
+        return x
+
+    def __matmul__(self, x: np.ndarray) -> np.ndarray:
+        return self.matvec(x)
+
+
+def spare_matrix_Abt(m: int, n: int, structured: bool = False):
     """Funkcja tworząca zestaw składający się z macierzy A (m,n), wektora b (m,)  i pomocniczego wektora t (m,)
     zawierających losowe wartości
     Parameters:
     m(int): ilość wierszy macierzy A
     n(int): ilość kolumn macierzy A
+    structured(bool): czy zwrócić macierz jako VandermondeMatrix (tylko węzły t) zamiast pełnej
     Results:
     (np.ndarray, np.ndarray): macierz o rozmiarze (m,n) i wektorem (m,)
                 Jeżeli dane wejściowe niepoprawne funkcja zwraca None
@@ -22,6 +109,8 @@ def spare_matrix_Abt(m: int, n: int):
             raise ValueError
         t = np.linspace(0, 1, m)
         b = np.cos(4 * t)
+        if structured:
+            return VandermondeMatrix(t, n), b
         A = np.vander(t, n)
         A = np.fliplr(A)
         return A, b
@@ -33,17 +122,19 @@ def square_from_rectan(A: np.ndarray, b: np.ndarray):
     """Funkcja przekształcająca układ równań z prostokątną macierzą współczynników na kwadratowy układ równań.
     Funkcja ma zwrócić nową macierz współczynników  i nowy wektor współczynników
     Parameters:
-      A: macierz A (m,n) zawierająca współczynniki równania
+      A: macierz A (m,n) zawierająca współczynniki równania (np.ndarray albo VandermondeMatrix)
       b: wektor b (m,) zawierający współczynniki po prawej stronie równania
     Results:
     (np.ndarray, np.ndarray): macierz o rozmiarze (n,n) i wektorem (n,)
              Jeżeli dane wejściowe niepoprawne funkcja zwraca None
      """
     try:
-        if not isinstance(A, np.ndarray) or not isinstance(b, np.ndarray):
+        if not isinstance(A, (np.ndarray, VandermondeMatrix)) or not isinstance(b, np.ndarray):
             raise ValueError
         if A.shape[0] != b.shape[0]:
             raise ValueError
+        if isinstance(A, VandermondeMatrix):
+            return A.gram(), A.rmatvec(b)
         aa = np.transpose(A) @ A
         bb = np.transpose(A) @ b
         return aa, bb
@@ -51,20 +142,152 @@ def square_from_rectan(A: np.ndarray, b: np.ndarray):
         return None
 
 
-def residual_norm(A: np.ndarray, x: np.ndarray, b: np.ndarray):
-    """Funkcja obliczająca normę residuum dla równania postaci:
-    Ax = b
-
-      Parameters:
-      A: macierz A (m,n) zawierająca współczynniki równania
-      x: wektor x (n,) zawierający rozwiązania równania
-      b: wektor b (m,) zawierający współczynniki po prawej stronie równania
-
-      Results:
-      (float)- wartość normy residuom dla podanych parametrów
-      """
+def least_squares(A, b: np.ndarray = None, method: str = 'qr', rcond: float = None,
+                  block_size: int = 10000):
+    """Funkcja rozwiązująca nadokreślony układ równań Ax = b w sensie najmniejszych kwadratów
+    bez tworzenia macierzy A^T A (jak w square_from_rectan), co nie podnosi wskaźnika
+    uwarunkowania do kwadratu.
+    Parameters:
+      A: macierz A (m,n), VandermondeMatrix (dla 'tsqr' i 'normal' wiersze podawane są blokami,
+         dla 'qr' i 'svd' tworzona jest macierz pełna), albo - dla method='tsqr' i 'normal' -
+         iterowalny zbiór bloków wierszy (A_i, b_i), np. z vander_row_blocks albo npy_row_blocks
+      b: wektor b (m,), wymagany dla macierzy A; dla bloków wierszy pomijany
+      method(str): metoda rozwiązania:
+        - 'qr' -> rozkład QR Householdera
+        - 'svd' -> obcięty rozkład SVD; pomijane są wartości singularne mniejsze niż rcond * s_max
+        - 'tsqr' -> QR liczony blokami po block_size wierszy (tsqr), bez trzymania całej A w pamięci
+        - 'normal' -> równania normalne sumowane blokami (normal_equations) i rozkład Cholesky'ego
+      rcond(float): względny próg obcięcia wartości singularnych, domyślnie eps * max(m, n)
+      block_size(int): liczba wierszy w bloku dla method='tsqr' i macierzy A
+    Results:
+    np.ndarray: rozwiązanie x (n,)
+             Jeżeli dane wejściowe niepoprawne funkcja zwraca None
+     """
     try:
-        rn = linalg.norm(b - A @ x)
-        return rn
-    except ValueError:
+        matrix = isinstance(A, (np.ndarray, VandermondeMatrix))
+        if matrix and (not isinstance(b, np.ndarray) or A.ndim != 2 or A.shape[0] != b.shape[0]):
+            raise ValueError
+        if isinstance(A, VandermondeMatrix) and method in ('qr', 'svd'):
+            A = A.toarray()
+        if method == 'tsqr':
+            blocks = row_blocks(A, b, block_size) if matrix else A
+            r_aug = tsqr(blocks)
+            n = r_aug.shape[1] - 1
+            return linalg.solve_triangular(r_aug[:n, :n], r_aug[:n, n])
+        if method == 'normal':
+            blocks = row_blocks(A, b, block_size) if matrix else A
+            aa, bb = normal_equations(blocks)
+            return linalg.cho_solve(linalg.cho_factor(aa), bb)
+        if not isinstance(A, np.ndarray) or not isinstance(b, np.ndarray):
+            raise ValueError
+        if A.ndim != 2 or A.shape[0] != b.shape[0]:
+            raise ValueError
+        if method == 'qr':
+            q, r = linalg.qr(A, mode='economic')
+            return linalg.solve_triangular(r, q.T @ b)
+        if method == 'svd':
+            u, s, vt = linalg.svd(A, full_matrices=False)
+            if rcond is None:
+                rcond = np.finfo(s.dtype).eps * max(A.shape)
+            rank = np.sum(s > rcond * s[0])
+            return vt[:rank].T @ ((u[:, :rank].T @ b) / s[:rank])
+        raise ValueError
+    except (ValueError, linalg.LinAlgError):
         return None
+
+
+def vander_row_blocks(m: int, n: int, block_size: int = 10000):
+    """Generator bloków wierszy układu z spare_matrix_Abt bez tworzenia całej macierzy (m,n):
+    t = linspace(0, 1, m), A = [1, t, t^2, ..., t^(n-1)], b = cos(4t)
+    Parameters:
+    m(int): ilość wierszy macierzy A
+    n(int): ilość kolumn macierzy A
+    block_size(int): liczba wierszy w bloku
+    Results:
+    (np.ndarray, np.ndarray): blok macierzy (block_size,n) i wektora (block_size,)
+    """
+    if not isinstance(m, int) or not isinstance(n, int) or m < 1 or block_size < 1:
+        raise ValueError
+    step = 1.0 / (m - 1) if m > 1 else 0.0
+    for start in range(0, m, block_size):
+        t = np.arange(start, min(start + block_size, m)) * step
+        yield np.vander(t, n, increasing=True), np.cos(4 * t)
+
+
+def npy_row_blocks(path_A: str, path_b: str, block_size: int = 10000):
+    """Generator bloków wierszy (A_i, b_i) wczytywanych z plików .npy mapowanych w pamięci,
+    dzięki czemu w pamięci jest tylko bieżący blok
+    Parameters:
+    path_A(str): ścieżka do pliku .npy z macierzą A (m,n)
+    path_b(str): ścieżka do pliku .npy z wektorem b (m,)
+    block_size(int): liczba wierszy w bloku
+    Results:
+    (np.ndarray, np.ndarray): blok macierzy (block_size,n) i wektora (block_size,)
+    """
+    A = np.load(path_A, mmap_mode='r')
+    b = np.load(path_b, mmap_mode='r')
+    for a_i, b_i in row_blocks(A, b, block_size):
+        yield np.asarray(a_i), np.asarray(b_i)
+
+
+def normal_equations(blocks):
+    """Funkcja sumująca równania normalne A^T A x = A^T b blok po bloku - wynik jak
+    w square_from_rectan, ale bez trzymania całej macierzy A w pamięci
+    Parameters:
+      blocks: iterowalny zbiór bloków wierszy (A_i, b_i), A_i (m_i,n), b_i (m_i,)
+    Results:
+    (np.ndarray, np.ndarray): macierz o rozmiarze (n,n) i wektorem (n,)
+     """
+    aa = None
+    bb = None
+    for a_i, b_i in blocks:
+        if aa is None:
+            aa = np.zeros((a_i.shape[1], a_i.shape[1]))
+            bb = np.zeros(a_i.shape[1])
+        aa += a_i.T @ a_i
+        bb += a_i.T @ b_i
+    if aa is None:
+        raise ValueError
+    return aa, bb
+
+
+def row_blocks(A: np.ndarray, b: np.ndarray, block_size: int = 10000):
+    """Generator kolejnych bloków wierszy (A_i, b_i) układu Ax = b
+    Parameters:
+      A: macierz A (m,n) albo VandermondeMatrix - wtedy pełny jest tylko bieżący blok
+      b: wektor b (m,)
+      block_size(int): liczba wierszy w bloku
+    Results:
+    (np.ndarray, np.ndarray): blok macierzy (block_size,n) i wektora (block_size,)
+     """
+    if A.shape[0] != b.shape[0] or block_size < 1:
+        raise ValueError
+    for start in range(0, A.shape[0], block_size):
+        if isinstance(A, VandermondeMatrix):
+            a_i = np.vander(A.t[start:start + block_size], A.n, increasing=True)
+        else:
+            a_i = A[start:start + block_size]
+        yield a_i, b[start:start + block_size]
+
+
+def tsqr(blocks) -> np.ndarray:
+    """Rozkład QR wysokiej macierzy liczony blokami wierszy (TSQR): po każdym bloku
+    czynnik R macierzy rozszerzonej [A | b] jest łączony z nowym blokiem i ponownie
+    rozkładany, więc w pamięci jest tylko jeden blok i macierz (n+1,n+1).
+    Parameters:
+      blocks: iterowalny zbiór bloków wierszy (A_i, b_i), A_i (m_i,n), b_i (m_i,)
+    Results:
+    np.ndarray: trójkątny czynnik R macierzy [A | b] (n+1,n+1); R[:n,:n] x = R[:n,n] to
+                rozwiązanie najmniejszych kwadratów, a |R[n,n]| to norma residuum
+     """
+    r_aug = None
+    for a_i, b_i in blocks:
+        block = np.column_stack([a_i, b_i])
+        if r_aug is not None:
+            block = np.vstack([r_aug, block])
+        r_aug = linalg.qr(block, mode='r')[0][:block.shape[1]]
+    if r_aug is None:
+        raise ValueError
+    if r_aug.shape[0] < r_aug.shape[1]:
+        r_aug = np.vstack([r_aug, np.zeros((r_aug.shape[1] - r_aug.shape[0], r_aug.shape[1]))])
+    return r_aug
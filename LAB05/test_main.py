@@ -28,3 +28,59 @@ def test_square_from_rectan(A: np.ndarray, b: np.ndarray, result):
     else:
         At, bt = main.square_from_rectan(A,b)
         assert At == pytest.approx(result[0]) and bt == pytest.approx(result[1]), 'Spodziewany wynik: {0}, aktualny {1}. Błedy wejścia.'.format(result, main.square_from_rectan(A,b))
+
+
+@pytest.mark.parametrize("method", ['qr', 'svd', 'tsqr'])
+def test_least_squares(method: str):
+    A, b = main.spare_matrix_Abt(200, 6)
+    x = main.least_squares(A, b, method, block_size=37)
+    assert x == pytest.approx(np.linalg.lstsq(A, b, rcond=None)[0], rel=1e-6), 'Rozwiązanie różni się od np.linalg.lstsq dla metody {0}.'.format(method)
+
+
+@pytest.mark.parametrize("m,n,block_size", [(100, 5, 7), (64, 8, 64), (10, 4, 3)])
+def test_tsqr(m: int, n: int, block_size: int):
+    A, b = main.spare_matrix_Abt(m, n)
+    r_aug = main.tsqr(main.vander_row_blocks(m, n, block_size))
+    x = np.linalg.lstsq(A, b, rcond=None)[0]
+    assert r_aug.shape == (n + 1, n + 1), 'Niepoprawny kształt czynnika R: {0}.'.format(r_aug.shape)
+    assert r_aug.T @ r_aug == pytest.approx(np.column_stack([A, b]).T @ np.column_stack([A, b])), 'R^T R różni się od [A|b]^T [A|b].'
+    assert abs(r_aug[n, n]) == pytest.approx(np.linalg.norm(b - A @ x), abs=1e-10), '|R[n,n]| powinno być normą residuum.'
+
+
+@pytest.mark.parametrize("method", ['tsqr', 'normal'])
+def test_least_squares_blocks(method: str):
+    A, b = main.spare_matrix_Abt(300, 5)
+    x = main.least_squares(main.vander_row_blocks(300, 5, 41), method=method)
+    assert x == pytest.approx(np.linalg.lstsq(A, b, rcond=None)[0], rel=1e-6), 'Rozwiązanie z bloków różni się od np.linalg.lstsq dla metody {0}.'.format(method)
+    assert main.least_squares(A, b, method, block_size=41) == pytest.approx(x, rel=1e-6), 'Rozwiązanie dla macierzy różni się od rozwiązania z bloków.'
+
+
+@pytest.mark.parametrize("method", ['qr', 'svd', 'tsqr', 'normal'])
+def test_least_squares_vandermonde(method: str):
+    A, b = main.spare_matrix_Abt(200, 6)
+    V = main.VandermondeMatrix(np.linspace(0, 1, 200), 6)
+    x = main.least_squares(V, b, method, block_size=37)
+    assert x == pytest.approx(np.linalg.lstsq(A, b, rcond=None)[0], rel=1e-6), 'Rozwiązanie dla VandermondeMatrix różni się od np.linalg.lstsq dla metody {0}.'.format(method)
+
+
+@pytest.mark.parametrize("method", ['qr', 'svd', 'tsqr', 'normal'])
+@pytest.mark.parametrize("b", [None, np.ones(10), [1.0] * 200])
+def test_least_squares_invalid_b(method: str, b):
+    A, _ = main.spare_matrix_Abt(200, 6)
+    assert main.least_squares(A, b, method) is None, 'Dla niepoprawnego b funkcja powinna zwrócić None.'
+
+
+@pytest.mark.parametrize("m,n", [(20, 5), (7, 7), (50, 1)])
+def test_vandermonde_matrix(m: int, n: int):
+    t = np.linspace(-1, 1, m)
+    V = main.VandermondeMatrix(t, n)
+    dense = np.vander(t, n, increasing=True)
+    rng = np.random.default_rng(0)
+    x, y = rng.random(n), rng.random(m)
+    assert V.shape == (m, n) and V.toarray() == pytest.approx(dense), 'toarray różni się od np.vander.'
+    assert V.matvec(x) == pytest.approx(dense @ x) and (V @ x) == pytest.approx(dense @ x), 'Niepoprawny iloczyn A x.'
+    assert V.rmatvec(y) == pytest.approx(dense.T @ y), 'Niepoprawny iloczyn A^T y.'
+    assert V.gram() == pytest.approx(dense.T @ dense), 'Niepoprawna macierz A^T A.'
+    if m == n:
+        b = dense @ x
+        assert V.solve(b) == pytest.approx(x, rel=1e-6), 'Algorytm Björcka-Pereyry nie odtwarza rozwiązania.'
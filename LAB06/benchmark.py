@@ -0,0 +1,48 @@
+import time
+import numpy as np
+
+import main
+
+
+def barycentric_loop(xi: np.ndarray, yi: np.ndarray, wi: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """Poprzednia, pętlowa wersja barycentric_inte - punkt odniesienia dla pomiarów."""
+    y = []
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for x in np.nditer(x):
+            le = wi / (x - xi)
+            y.append(yi @ le / sum(le))
+    return np.array(y)
+
+
+def measure(fun, *args, repeat: int = 3) -> float:
+    """Zwraca najkrótszy z repeat czasów wykonania fun(*args) w sekundach."""
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fun(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == '__main__':
+    f = lambda x: np.cos(x) + x ** 2
+    for n, points in [(10, 10 ** 4), (100, 10 ** 4), (500, 10 ** 4), (500, 10 ** 6)]:
+        xi = main.chebyshev_nodes(n)
+        wi = main.bar_czeb_weights(n)
+        yi = f(xi)
+        x = np.linspace(-1, 1, points)
+
+        t_vec = measure(main.barycentric_inte, xi, yi, wi, x)
+        if points <= 10 ** 4:
+            t_loop = measure(barycentric_loop, xi, yi, wi, x)
+            speedup = f'{t_loop / t_vec:8.1f}x'
+        else:
+            t_loop = np.nan
+            speedup = '     ---'
+        print(f'n = {n:4d}, punkty = {points:8d} | pętla: {points / t_loop:12.0f} pkt/s | '
+              f'wektorowo: {points / t_vec:12.0f} pkt/s | przyspieszenie: {speedup}')
+
+    series = np.stack([f(xi) * k for k in range(1, 17)], axis=1)
+    t_multi = measure(main.barycentric_inte, xi, series, wi, x)
+    print(f'n = {n:4d}, punkty = {points:8d}, serie = {series.shape[1]:3d} | '
+          f'wektorowo: {points * series.shape[1] / t_multi:12.0f} wartości/s')
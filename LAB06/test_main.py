@@ -46,3 +46,44 @@ def test_barycentric_inte(xi:np.ndarray,yi:np.ndarray,wi:np.ndarray,x:np.ndarray
         assert main.barycentric_inte(xi,yi, wi,x) is None, 'Spodziewany wynik: {0}, aktualny {1}. Błedy wejścia.'.format(result, main.barycentric_inte(xi,yi, wi,x))
     else:
         assert main.barycentric_inte(xi,yi, wi,x) == pytest.approx(result), 'Spodziewany wynik: {0}, aktualny {1}. Błędy implementacji.'.format(result, main.barycentric_inte(xi,yi, wi,x))
+
+
+@pytest.mark.parametrize("n,chunk_size", [(5, None), (12, None), (12, 4)])
+def test_barycentric_exact_node(n: int, chunk_size: int):
+    xi, wi = main.chebyshev_nodes(n), main.bar_czeb_weights(n)
+    yi = np.cos(3 * xi)
+    result = main.barycentric_inte(xi, yi, wi, xi.copy(), chunk_size)
+    assert np.array_equal(result, yi), 'W węzłach interpolacja powinna zwracać dokładnie yi, aktualny {0}.'.format(result)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_barycentric_chunks(chunk_size: int):
+    xi, wi = main.chebyshev_nodes(10), main.bar_czeb_weights(10)
+    yi = np.column_stack([np.sin(xi), np.abs(xi)])
+    x = np.linspace(-1, 1, 101)
+    result = main.barycentric_inte(xi, yi, wi, x, chunk_size)
+    expected_values = np.column_stack([main.barycentric_inte(xi, yi[:, j], wi, x) for j in range(2)])
+    assert result.shape == (101, 2), 'Niepoprawny kształt wyniku: {0}.'.format(result.shape)
+    assert result == pytest.approx(expected_values), 'Wynik liczony blokami różni się od wyniku dla pojedynczych serii.'
+
+
+@pytest.mark.parametrize("n,family,chunk_size", [(10, 'chebyshev', None), (10, 'chebyshev', 7), (8, 'equidistant', 3)])
+def test_barycentric_interpolant(n: int, family: str, chunk_size: int):
+    xi, wi = main.nodes_and_weights(n, family)
+    x = np.linspace(-1, 1, 41)
+    yi = np.column_stack([np.sin(xi), xi ** 3])
+    interp = main.BarycentricInterpolant(n, family, x=x, yi=yi)
+    expected_values = main.barycentric_inte(xi, yi, wi, x, chunk_size)
+    assert interp() == pytest.approx(expected_values), 'Macierz bazowa daje inny wynik niż barycentric_inte.'
+    assert interp(x) == pytest.approx(expected_values), 'Wywołanie z argumentami daje inny wynik niż barycentric_inte.'
+    interp.update_values(xi ** 2)
+    assert interp() == pytest.approx(x ** 2), 'Wielomian stopnia <= n powinien być odtworzony dokładnie.'
+    assert interp._denominator.shape == x.shape, 'Zapamiętywane powinny być tylko mianowniki (p,).'
+
+
+@pytest.mark.parametrize("x,yi,error", [(None, None, ValueError), (np.linspace(-1, 1, 5), None, ValueError),
+                                        (None, np.ones(11), ValueError), ([0.5], np.ones(11), TypeError)])
+def test_barycentric_interpolant_invalid(x, yi, error):
+    interp = main.BarycentricInterpolant(10, 'chebyshev', yi=yi)
+    with pytest.raises(error):
+        interp(x)
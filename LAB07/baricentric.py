@@ -4,8 +4,13 @@ import scipy
 import pickle
 import matplotlib.pyplot as plt
 
+from functools import lru_cache
+from scipy.special import gammaln
 from typing import Union, List, Tuple
 
+# liczba elementów macierzy pomocniczej (punkty x węzły) przetwarzanych w jednym bloku
+_BLOCK_ELEMENTS = 2 ** 22
+
 
 def chebyshev_nodes(n: int = 10) -> np.ndarray:
     """Funkcja tworząca wektor zawierający węzły czybyszewa w postaci wektora (n+1,)
@@ -51,37 +56,179 @@ def bar_czeb_weights(n: int = 10) -> np.ndarray:
         return None
 
 
-def barycentric_inte(xi: np.ndarray, yi: np.ndarray, wi: np.ndarray, x: np.ndarray) -> np.ndarray:
+def barycentric_inte(xi: np.ndarray, yi: np.ndarray, wi: np.ndarray, x: np.ndarray,
+                     chunk_size: int = None) -> np.ndarray:
     """Funkcja przprowadza interpolację metodą barycentryczną dla zadanych węzłów xi
         i wartości funkcji interpolowanej yi używając wag wi. Zwraca wyliczone wartości
         funkcji interpolującej dla argumentów x w postaci wektora (n,) gdzie n to dłógość
         wektora n. 
+        Obliczenia są wektorowe i wykonywane blokami po chunk_size punktów, dzięki czemu
+        pamięć pomocnicza jest ograniczona do (chunk_size, m) elementów. Argumenty x
+        pokrywające się z węzłem zwracają dokładnie wartość yi w tym węźle.
     
     Parameters:
     xi(np.ndarray): węzły interpolacji w postaci wektora (m,), gdzie m > 0
-    yi(np.ndarray): wartości funkcji interpolowanej w węzłach w postaci wektora (m,), gdzie m>0
+    yi(np.ndarray): wartości funkcji interpolowanej w węzłach w postaci wektora (m,)
+                    albo macierzy (m,k) dla k serii danych na tych samych węzłach, gdzie m>0
     wi(np.ndarray): wagi interpolacji w postaci wektora (m,), gdzie m>0
     x(np.ndarray): argumenty dla funkcji interpolującej (n,), gdzie n>0 
+    chunk_size(int): liczba argumentów x przetwarzanych w jednym bloku,
+                     domyślnie dobierana tak, aby blok miał ok. _BLOCK_ELEMENTS elementów
      
     Results:
-    np.ndarray: wektor wartości funkcji interpolujący o rozmiarze (n,). 
+    np.ndarray: wektor wartości funkcji interpolujący o rozmiarze (n,) albo macierz (n,k)
+                dla yi w postaci macierzy (m,k). 
                 Jeżeli dane wejściowe niepoprawne funkcja zwraca None
     """
     try:
         if not all(isinstance(i, np.ndarray) for i in [xi, yi, wi, x]):
             raise TypeError
-        if xi.shape != yi.shape or yi.shape != wi.shape:
+        if xi.ndim != 1 or xi.shape != wi.shape or yi.ndim > 2 or yi.shape[0] != xi.shape[0]:
+            raise ValueError
+        if chunk_size is None:
+            chunk_size = max(1, _BLOCK_ELEMENTS // xi.shape[0])
+        if not isinstance(chunk_size, int) or chunk_size < 1:
             raise ValueError
-        y = []
-        for x in np.nditer(x):
-            le = wi / (x - xi)
-            y.append(yi @ le / sum(le))
+        x = x.ravel()
+        values = yi.reshape(xi.shape[0], -1)
+        y = np.empty((x.shape[0], values.shape[1]), dtype=np.result_type(yi, x, wi, float))
+        for start in range(0, x.shape[0], chunk_size):
+            diff = x[start:start + chunk_size, np.newaxis] - xi
+            exact = diff == 0
+            diff[exact] = 1
+            le = wi / diff
+            block = (le @ values) / np.sum(le, axis=1, keepdims=True)
+            rows, cols = np.nonzero(exact)
+            block[rows] = values[cols]
+            y[start:start + chunk_size] = block
 
-        return np.array(y)
+        return y if yi.ndim == 2 else y[:, 0]
     except (ValueError, TypeError):
         return None
 
 
+@lru_cache(maxsize=32)
+def nodes_and_weights(n: int, family: str = 'chebyshev') -> Tuple[np.ndarray, np.ndarray]:
+    """Funkcja zwracająca węzły i wagi barycentryczne dla danej rodziny węzłów.
+    Wyniki są zapamiętywane (LRU) dla par (n, family), a zwracane tablice są tylko do odczytu.
+
+    Parameters:
+    n(int): numer ostatniego węzła, n > 0
+    family(str): rodzina węzłów:
+        - 'chebyshev' -> węzły Czebyszewa (chebyshev_nodes, bar_czeb_weights)
+        - 'equidistant' -> węzły równoodległe na przedziale [-1, 1]
+
+    Results:
+    (np.ndarray, np.ndarray): węzły (n+1,) i wagi (n+1,)
+                Jeżeli dane wejściowe niepoprawne funkcja zgłasza ValueError
+    """
+    if not isinstance(n, int) or n < 1:
+        raise ValueError
+    if family == 'chebyshev':
+        xi = chebyshev_nodes(n)
+        wi = bar_czeb_weights(n)
+    elif family == 'equidistant':
+        j = np.arange(n + 1)
+        xi = np.linspace(-1, 1, n + 1)
+        # (-1)^j * C(n, j) przeskalowane przez C(n, n//2), aby uniknąć przepełnienia
+        log_binom = gammaln(n + 1) - gammaln(j + 1) - gammaln(n - j + 1)
+        wi = (-1.0) ** j * np.exp(log_binom - log_binom.max())
+    else:
+        raise ValueError
+    xi.flags.writeable = False
+    wi.flags.writeable = False
+    return xi, wi
+
+
+class BarycentricInterpolant:
+    """Interpolacja barycentryczna na stałej siatce węzłów.
+    Węzły i wagi pochodzą z pamięci podręcznej nodes_and_weights, a dla zadanych z góry
+    argumentów x mianowniki sum_j w_j / (x - x_j) są liczone raz i zapamiętywane jako wektor (p,),
+    więc po zmianie wartości (update_values) liczone są tylko liczniki - blokami po ok.
+    _BLOCK_ELEMENTS elementów, bez przechowywania macierzy bazowej (p, n+1).
+    Niepoprawne dane wejściowe powodują TypeError albo ValueError (również w __call__).
+
+    Parameters:
+    n(int): numer ostatniego węzła, n > 0
+    family(str): rodzina węzłów, 'chebyshev' albo 'equidistant'
+    x(np.ndarray): opcjonalne argumenty (p,), dla których wyznaczane są mianowniki
+    yi(np.ndarray): opcjonalne wartości w węzłach (n+1,) albo (n+1,k)
+    """
+
+    def __init__(self, n: int = 10, family: str = 'chebyshev', x: np.ndarray = None, yi: np.ndarray = None):
+        self.n = n
+        self.family = family
+        self.xi, self.wi = nodes_and_weights(n, family)
+        self.x = None
+        self.yi = None
+        self._denominator = None
+        self._node = None
+        if x is not None:
+            self.set_points(x)
+        if yi is not None:
+            self.update_values(yi)
+
+    def set_points(self, x: np.ndarray) -> 'BarycentricInterpolant':
+        """Wyznacza i zapamiętuje mianowniki (p,) dla argumentów x oraz indeksy węzłów,
+        z którymi argumenty się pokrywają (-1 dla pozostałych)."""
+        if not isinstance(x, np.ndarray):
+            raise TypeError
+        x = x.ravel()
+        if x.shape[0] == 0 or not np.issubdtype(x.dtype, np.number):
+            raise ValueError
+        denominator = np.empty(x.shape[0], dtype=np.result_type(x, self.wi, float))
+        node = np.full(x.shape[0], -1)
+        for part, le, exact in self._blocks(x):
+            denominator[part] = np.sum(le, axis=1)
+            rows, cols = np.nonzero(exact)
+            node[part][rows] = cols
+        self.x = x
+        self._denominator = denominator
+        self._node = node
+        return self
+
+    def update_values(self, yi: np.ndarray) -> 'BarycentricInterpolant':
+        """Podmienia wartości funkcji w węzłach (n+1,) albo (n+1,k) bez przeliczania węzłów i wag."""
+        yi = np.asarray(yi)
+        if yi.ndim not in (1, 2) or yi.shape[0] != self.n + 1:
+            raise ValueError
+        self.yi = yi
+        return self
+
+    def __call__(self, x: np.ndarray = None) -> np.ndarray:
+        """Wartości interpolacji dla argumentów x, a dla x=None dla argumentów z set_points
+        (liczniki liczone blokami, mianowniki z set_points).
+        Brak wartości, brak argumentów albo niepoprawne x powodują TypeError albo ValueError."""
+        if self.yi is None:
+            raise ValueError
+        if x is not None:
+            if not isinstance(x, np.ndarray):
+                raise TypeError
+            y = barycentric_inte(self.xi, self.yi, self.wi, x)
+            if y is None:
+                raise ValueError
+            return y
+        if self._denominator is None:
+            raise ValueError
+        values = self.yi.reshape(self.n + 1, -1)
+        y = np.empty((self.x.shape[0], values.shape[1]), dtype=np.result_type(values, self._denominator))
+        for part, le, _ in self._blocks(self.x):
+            y[part] = (le @ values) / self._denominator[part, np.newaxis]
+        exact = self._node >= 0
+        y[exact] = values[self._node[exact]]
+        return y if self.yi.ndim == 2 else y[:, 0]
+
+    def _blocks(self, x: np.ndarray):
+        """Generator bloków (wycinek, w_j / (x - x_j), maska x == x_j) dla kolejnych
+        bloków argumentów x po ok. _BLOCK_ELEMENTS elementów; dla x == x_j dzielnik zastępowany jest 1."""
+        chunk_size = max(1, _BLOCK_ELEMENTS // (self.n + 1))
+        for start in range(0, x.shape[0], chunk_size):
+            diff = x[start:start + chunk_size, np.newaxis] - self.xi
+            exact = diff == 0
+            diff[exact] = 1
+            yield slice(start, start + chunk_size), self.wi / diff, exact
+
+
 def L_inf(xr: Union[int, float, List, np.ndarray], x: Union[int, float, List, np.ndarray]) -> float:
     """Obliczenie normy  L nieskończonośćg.
     Funkcja powinna działać zarówno na wartościach skalarnych, listach jak i wektorach biblioteki numpy.
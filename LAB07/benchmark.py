@@ -0,0 +1,42 @@
+import time
+import numpy as np
+
+import main
+
+
+def measure(fun, *args, repeat: int = 3, **kwargs) -> float:
+    """Zwraca najkrótszy z repeat czasów wykonania fun(*args, **kwargs) w sekundach."""
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fun(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == '__main__':
+    f = lambda x: 1 / (25 * x ** 2 + 1)
+
+    print('cubic_spline: pełna macierz + Jacobi vs układ trójdiagonalny')
+    for n in [10, 30, 100]:
+        x = np.linspace(-1, 1, n)
+        y = f(x)
+        t_jacobi = measure(main.cubic_spline, x, y, method='jacobi', repeat=1)
+        t_banded = measure(main.cubic_spline, x, y, method='banded')
+        print(f'n = {n:8d} | jacobi: {t_jacobi:10.5f} s | banded: {t_banded:10.5f} s | '
+              f'przyspieszenie: {t_jacobi / t_banded:10.1f}x')
+
+    for n in [10 ** 4, 10 ** 5, 10 ** 6]:
+        x = np.linspace(-1, 1, n)
+        y = f(x)
+        t_banded = measure(main.cubic_spline, x, y, method='banded')
+        print(f'n = {n:8d} | jacobi: {"---":>12s} | banded: {t_banded:10.5f} s')
+
+    print('cubic_spline: k serii na wspólnych węzłach - pętla vs jedno wywołanie')
+    n, k = 1000, 1000
+    x = np.linspace(-1, 1, n)
+    Y = np.stack([f(x) * (j + 1) for j in range(k)], axis=1)
+    t_loop = measure(lambda: [main.cubic_spline(x, Y[:, j]) for j in range(k)], repeat=1)
+    t_batch = measure(main.cubic_spline, x, Y)
+    print(f'n = {n:8d}, k = {k:6d} | pętla: {t_loop:10.5f} s | macierz (n,k): {t_batch:10.5f} s | '
+          f'przyspieszenie: {t_loop / t_batch:10.1f}x')
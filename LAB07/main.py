@@ -1,6 +1,12 @@
+import os
+import sys
 import numpy as np
 import scipy
 import pickle
+from scipy import linalg
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import jacobi_iterations
 
 
 # from typing import Union, List, Tuple
@@ -26,19 +32,30 @@ def first_spline(x: np.ndarray, y: np.ndarray):
         return None
 
 
-def cubic_spline(x: np.ndarray, y: np.ndarray, tol=1e-100):
+def cubic_spline(x: np.ndarray, y: np.ndarray, tol=1e-100, method: str = 'banded'):
     """
-    Interpolacja splajnów cubicznych
+    Interpolacja splajnów cubicznych (naturalnych)
+
+    Parameters:
+    x(np.ndarray): węzły (n,)
+    y(np.ndarray): wartości funkcji w węzłach (n,) albo (n,k) dla k serii na tych samych węzłach
+    tol(float): dokładność metody Jacobiego (tylko dla method='jacobi')
+    method(str): sposób rozwiązania układu na współczynniki c:
+        - 'banded' -> układ trójdiagonalny rozwiązywany w O(n) (algorytm Thomasa, LAPACK);
+                      rozkład jest liczony raz dla wszystkich k kolumn y
+        - 'jacobi' -> pełna macierz (n,n) i iteracja Jacobiego
 
     Returns:
-    b współczynnik przy x stopnia 1
-    c współczynnik przy x stopnia 2
-    d współczynnik przy x stopnia 3
+    b współczynnik przy x stopnia 1, (n-1,) albo (n-1,k)
+    c współczynnik przy x stopnia 2, (n,) albo (n,k)
+    d współczynnik przy x stopnia 3, (n-1,) albo (n-1,k)
     """
     try:
         if not isinstance(x, np.ndarray) or not isinstance(y, np.ndarray):
             raise ValueError
-        if x.shape != y.shape:
+        if x.ndim != 1 or y.ndim not in [1, 2] or x.shape[0] != y.shape[0]:
+            raise ValueError
+        if method not in ['banded', 'jacobi']:
             raise ValueError
         ### check if sorted
         if np.any(np.diff(x) < 0):
@@ -46,61 +63,237 @@ def cubic_spline(x: np.ndarray, y: np.ndarray, tol=1e-100):
             x = x[idx]
             y = y[idx]
 
-        size = len(x)
         delta_x = np.diff(x)
-        delta_y = np.diff(y)
-
-        ### Get matrix A
-        A = np.zeros(shape=(size, size))
-        b = np.zeros(shape=(size, 1))
-        A[0, 0] = 1
-        A[-1, -1] = 1
-
-        for i in range(1, size - 1):
-            A[i, i - 1] = delta_x[i - 1]
-            A[i, i + 1] = delta_x[i]
-            A[i, i] = 2 * (delta_x[i - 1] + delta_x[i])
-            ### Get matrix b
-            b[i, 0] = 3 * (delta_y[i] / delta_x[i] - delta_y[i - 1] / delta_x[i - 1])
+        delta_y = np.diff(y, axis=0)
+        if y.ndim == 2:
+            delta_x = delta_x[:, np.newaxis]
+        lower, diag, upper, rhs = spline_system(delta_x, delta_y)
 
         ### Solves for c in Ac = b
-        c = jacobi(A, b, np.zeros(len(A)), tol=tol, n_iterations=1000)
+        if method == 'banded':
+            c = tridiagonal_factor_solve(tridiagonal_factor(lower, diag, upper), rhs)
+        else:
+            A = np.diag(diag) + np.diag(lower, -1) + np.diag(upper, 1)
+            c = np.stack([jacobi(A, r, np.zeros(len(A)), tol=tol, n_iterations=1000)
+                          for r in rhs.reshape(len(A), -1).T], axis=-1).reshape(rhs.shape)
 
         ### Solves for d and b
-        d = np.zeros(shape=(size - 1, 1))
-        b = np.zeros(shape=(size - 1, 1))
-        for i in range(0, len(d)):
-            d[i] = (c[i + 1] - c[i]) / (3 * delta_x[i])
-            b[i] = (delta_y[i] / delta_x[i]) - (delta_x[i] / 3) * (2 * c[i] + c[i + 1])
+        slope = delta_y / delta_x
+        d = (c[1:] - c[:-1]) / (3 * delta_x)
+        b = slope - (delta_x / 3) * (2 * c[:-1] + c[1:])
 
-        return b.squeeze(), c.squeeze(), d.squeeze()
+        return b, c, d
     except ValueError:
         return None
 
 
-def jacobi(A, b, x0, tol, n_iterations=300):
+def spline_system(delta_x: np.ndarray, delta_y: np.ndarray):
+    """
+    Układ trójdiagonalny na współczynniki c naturalnego splajnu kubicznego zapisany
+    w postaci trzech przekątnych
+
+    Parameters:
+    delta_x(np.ndarray): długości przedziałów (n-1,) albo (n-1,1)
+    delta_y(np.ndarray): przyrosty wartości na przedziałach (n-1,) albo (n-1,k)
+
+    Returns:
+    lower - przekątna pod główną (n-1,)
+    diag - przekątna główna (n,)
+    upper - przekątna nad główną (n-1,)
+    rhs - prawa strona układu (n,) albo (n,k)
+    """
+    size = len(delta_x) + 1
+    slope = delta_y / delta_x
+    delta_x = delta_x.reshape(-1)
+    diag = np.ones(size)
+    lower = np.zeros(size - 1)
+    upper = np.zeros(size - 1)
+    rhs = np.zeros((size,) + slope.shape[1:])
+
+    diag[1:-1] = 2 * (delta_x[:-1] + delta_x[1:])
+    lower[:-1] = delta_x[:-1]
+    upper[1:] = delta_x[1:]
+    rhs[1:-1] = 3 * (slope[1:] - slope[:-1])
+    return lower, diag, upper, rhs
+
+
+def tridiagonal_factor(lower: np.ndarray, diag: np.ndarray, upper: np.ndarray):
+    """
+    Rozkład LU (z częściowym wyborem elementu głównego) macierzy trójdiagonalnej w O(n),
+    do wielokrotnego użycia w tridiagonal_factor_solve
+
+    Parameters:
+    lower(np.ndarray): przekątna pod główną (n-1,)
+    diag(np.ndarray): przekątna główna (n,)
+    upper(np.ndarray): przekątna nad główną (n-1,)
+
+    Returns:
+    krotka z rozkładem macierzy (wynik LAPACK ?gttrf, a dla n < 3 wynik linalg.lu_factor)
+    """
+    if len(diag) < 3:
+        return linalg.lu_factor(np.diag(diag) + np.diag(lower, -1) + np.diag(upper, 1))
+    gttrf, = linalg.get_lapack_funcs(('gttrf',), (lower, diag, upper))
+    dl, d, du, du2, ipiv, info = gttrf(lower, diag, upper)
+    if info != 0:
+        raise ValueError
+    return dl, d, du, du2, ipiv
+
+
+def tridiagonal_factor_solve(factor, rhs: np.ndarray):
+    """
+    Rozwiązanie układu trójdiagonalnego dla rozkładu z tridiagonal_factor
+
+    Parameters:
+    factor: rozkład zwrócony przez tridiagonal_factor
+    rhs(np.ndarray): prawa strona układu (n,) albo (n,k) - każda kolumna osobno
+
+    Returns:
+    x - rozwiązanie układu (n,) albo (n,k)
+    """
+    if len(factor) == 2:
+        return linalg.lu_solve(factor, rhs)
+    dl, d, du, du2, ipiv = factor
+    gttrs, = linalg.get_lapack_funcs(('gttrs',), (dl, d, du, rhs))
+    x, info = gttrs(dl, d, du, du2, ipiv, rhs)
+    if info != 0:
+        raise ValueError
+    return x
+
+
+def tridiagonal_solve(lower: np.ndarray, diag: np.ndarray, upper: np.ndarray, rhs: np.ndarray):
+    """
+    Rozwiązanie układu trójdiagonalnego w czasie i pamięci O(n) bez budowania pełnej macierzy
+
+    Parameters:
+    lower(np.ndarray): przekątna pod główną (n-1,)
+    diag(np.ndarray): przekątna główna (n,)
+    upper(np.ndarray): przekątna nad główną (n-1,)
+    rhs(np.ndarray): prawa strona układu (n,) albo (n,k)
+
+    Returns:
+    x - rozwiązanie układu (n,) albo (n,k)
+    """
+    return tridiagonal_factor_solve(tridiagonal_factor(lower, diag, upper), rhs)
+
+
+class Spline:
+    """
+    Splajn zapisany lokalnie na każdym przedziale [x_i, x_i+1]:
+    S_i(t) = coef[0, i] + coef[1, i] (t - x_i) + ... + coef[k, i] (t - x_i)^k
+
+    Parameters:
+    x(np.ndarray): posortowane rosnąco węzły (n,)
+    coef(np.ndarray): współczynniki lokalne (k+1, n-1) albo (k+1, n-1, m) dla m serii danych
+    """
+
+    def __init__(self, x: np.ndarray, coef: np.ndarray):
+        if x.ndim != 1 or coef.shape[1] != len(x) - 1 or np.any(np.diff(x) < 0):
+            raise ValueError
+        self.x = x
+        self.coef = coef
+
+    @classmethod
+    def linear(cls, x: np.ndarray, y: np.ndarray) -> 'Spline':
+        """Splajn pierwszego stopnia (first_spline) dla węzłów x i wartości y"""
+        x, y = _sorted_knots(x, y)
+        res = first_spline(x, y)
+        if res is None:
+            raise ValueError
+        a, _ = res
+        return cls(x, np.stack([y[:-1], a]))
+
+    @classmethod
+    def cubic(cls, x: np.ndarray, y: np.ndarray, method: str = 'banded') -> 'Spline':
+        """Naturalny splajn kubiczny (cubic_spline) dla węzłów x i wartości y (n,) albo (n,m)"""
+        x, y = _sorted_knots(x, y)
+        res = cubic_spline(x, y, method=method)
+        if res is None:
+            raise ValueError
+        b, c, d = res
+        return cls(x, np.stack([y[:-1], b, c[:-1], d]))
+
+    def intervals(self, xq: np.ndarray) -> np.ndarray:
+        """Indeksy przedziałów dla punktów xq (wyszukiwanie binarne); punkty spoza
+        zakresu węzłów są przypisywane do skrajnych przedziałów"""
+        idx = np.searchsorted(self.x, xq, side='right') - 1
+        return np.clip(idx, 0, len(self.x) - 2)
+
+    def derivative_coef(self, nu: int = 0) -> np.ndarray:
+        """Współczynniki lokalne nu-tej pochodnej splajnu"""
+        if nu < 0:
+            raise ValueError
+        k = self.coef.shape[0]
+        if nu >= k:
+            return np.zeros((1,) + self.coef.shape[1:])
+        p = np.arange(k - nu)
+        factor = np.ones(k - nu)
+        for j in range(1, nu + 1):
+            factor *= p + j
+        return self.coef[nu:] * factor.reshape((-1,) + (1,) * (self.coef.ndim - 1))
+
+    def __call__(self, xq: np.ndarray, nu: int = 0) -> np.ndarray:
+        """Wartości splajnu (albo jego nu-tej pochodnej) w punktach xq, liczone schematem Hornera"""
+        xq = np.asarray(xq, dtype=float)
+        return self._evaluate(xq, self.intervals(xq), self.derivative_coef(nu))
+
+    def evaluate_sorted(self, chunks, nu: int = 0):
+        """Generator wartości splajnu dla strumienia posortowanych rosnąco bloków punktów.
+        Wyszukiwanie w kolejnym bloku zaczyna się od przedziału, na którym skończył się poprzedni.
+
+        Parameters:
+        chunks: iterowalny zbiór posortowanych tablic punktów, kolejne bloki rosnąco
+        nu(int): rząd pochodnej
+
+        Returns:
+        np.ndarray - wartości dla kolejnych bloków
+        """
+        coef = self.derivative_coef(nu)
+        start = 0
+        for xq in chunks:
+            xq = np.asarray(xq, dtype=float)
+            if xq.size == 0:
+                yield self._evaluate(xq, np.zeros(0, dtype=int), coef)
+                continue
+            idx = start + np.searchsorted(self.x[start:], xq, side='right') - 1
+            idx = np.clip(idx, 0, len(self.x) - 2)
+            start = int(idx[-1])
+            yield self._evaluate(xq, idx, coef)
+
+    def _evaluate(self, xq: np.ndarray, idx: np.ndarray, coef: np.ndarray) -> np.ndarray:
+        t = xq - self.x[idx]
+        t = t.reshape(t.shape + (1,) * (coef.ndim - 2))
+        y = coef[-1][idx]
+        for c in coef[-2::-1]:
+            y = y * t + c[idx]
+        return y
+
+
+def _sorted_knots(x: np.ndarray, y: np.ndarray):
+    if not isinstance(x, np.ndarray) or not isinstance(y, np.ndarray):
+        raise ValueError
+    if x.ndim != 1 or y.shape[:1] != x.shape:
+        raise ValueError
+    if np.any(np.diff(x) < 0):
+        idx = np.argsort(x)
+        x = x[idx]
+        y = y[idx]
+    return x, y
+
+
+def jacobi(A, b, x0, tol, n_iterations=300, check_every=1):
     """
     Iteracyjne rozwiązanie równania Ax=b dla zadanego x0
 
+    Parameters:
+    A - macierz współczynników (gęsta albo scipy.sparse)
+    b - prawa strona układu
+    x0 - rozwiązanie początkowe
+    tol - dokładność normy ||x - x_prev||
+    n_iterations - ograniczenie iteracji
+    check_every - co ile iteracji sprawdzany jest warunek stopu
+
     Returns:
     x - estymowane rozwiązanie
     """
-    n = A.shape[0]
-    x = x0.copy()
-    x_prev = x0.copy()
-    counter = 0
-    x_diff = tol + 1
-
-    while (x_diff > tol) and (counter < n_iterations):  # iteration level
-        for i in range(0, n):  # element wise level for x
-            s = 0
-            for j in range(0, n):  # summation for i !=j
-                if i != j:
-                    s += A[i, j] * x_prev[j]
-
-            x[i] = (b[i] - s) / A[i, i]
-        # update values
-        counter += 1
-        x_diff = (np.sum((x - x_prev) ** 2)) ** 0.5
-        x_prev = x.copy()  # use new x for next iteration
+    x, _ = jacobi_iterations(A, b, x0, epsilon=tol, maxiter=n_iterations, check_every=check_every)
     return x
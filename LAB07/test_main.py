@@ -27,4 +27,58 @@ def test_cubic_spline(x: np.ndarray, y: np.ndarray, result):
         assert main.cubic_spline(x,y) is None, 'Spodziewany wynik: {0}, aktualny {1}. Błedy wejścia.'.format(result, main.cubic_spline(x,y))
     else:
         tresult = main.cubic_spline(x,y)       
-        assert tresult[0] == pytest.approx(result[0]) and tresult[1] == pytest.approx(result[1]) , 'Spodziewany wynik: {0}, aktualny {1}. Błedy wejścia.'.format(result, main.cubic_spline(x,y))
\ No newline at end of file
+        assert tresult[0] == pytest.approx(result[0]) and tresult[1] == pytest.approx(result[1]) , 'Spodziewany wynik: {0}, aktualny {1}. Błedy wejścia.'.format(result, main.cubic_spline(x,y))
+
+@pytest.mark.parametrize("n", [1, 2, 10, 100])
+def test_tridiagonal_solve(n: int):
+    rng = np.random.default_rng(n)
+    lower, upper = rng.random(n - 1), rng.random(n - 1)
+    diag = 3 + rng.random(n)
+    rhs = rng.random(n)
+    A = np.diag(diag) + np.diag(lower, -1) + np.diag(upper, 1)
+    assert main.tridiagonal_solve(lower, diag, upper, rhs) == pytest.approx(np.linalg.solve(A, rhs)), 'Rozwiązanie różni się od np.linalg.solve.'
+
+
+@pytest.mark.parametrize("x", [np.linspace(0, 1, 6), np.array([0.0, 0.1, 0.5, 2.0, 2.2])])
+def test_cubic_spline_banded_vs_jacobi(x: np.ndarray):
+    y = np.exp(x)
+    banded, jacobi = main.cubic_spline(x, y, method='banded'), main.cubic_spline(x, y, method='jacobi')
+    for coef_banded, coef_jacobi in zip(banded, jacobi):
+        assert coef_banded == pytest.approx(coef_jacobi, abs=1e-8), 'Współczynniki różnią się między metodami.'
+
+
+@pytest.mark.parametrize("method", ['banded', 'jacobi'])
+@pytest.mark.parametrize("x", [np.linspace(0, 2 * np.pi, 9), np.array([0.0, 0.3, 1.1, 1.5, 2.7, 3.0])])
+def test_spline_vs_scipy(method: str, x: np.ndarray):
+    from scipy.interpolate import CubicSpline
+    y = np.sin(x)
+    spline = main.Spline.cubic(x, y, method)
+    reference = CubicSpline(x, y, bc_type='natural')
+    xq = np.linspace(x[0], x[-1], 57)
+    for nu in range(3):
+        assert spline(xq, nu) == pytest.approx(reference(xq, nu), abs=1e-6), 'Pochodna rzędu {0} różni się od scipy CubicSpline.'.format(nu)
+    chunks = np.array_split(xq, 5)
+    assert np.concatenate(list(spline.evaluate_sorted(chunks))) == pytest.approx(reference(xq), abs=1e-6), 'evaluate_sorted różni się od scipy CubicSpline.'
+
+
+@pytest.mark.parametrize("method", ['banded', 'jacobi'])
+def test_cubic_spline_many_series(method: str):
+    x = np.linspace(0, 3, 8)
+    y = np.column_stack([np.sin(x), x ** 2, np.ones_like(x)])
+    b, c, d = main.cubic_spline(x, y, method=method)
+    for j in range(y.shape[1]):
+        for coef, single in zip((b, c, d), main.cubic_spline(x, y[:, j], method=method)):
+            assert coef[:, j] == pytest.approx(single, abs=1e-8), 'Kolumna {0} różni się od osobnego wywołania.'.format(j)
+    rhs = np.random.default_rng(0).random((6, 2))
+    lower, diag, upper = np.ones(5), 4 * np.ones(6), np.ones(5)
+    A = np.diag(diag) + np.diag(lower, -1) + np.diag(upper, 1)
+    assert main.tridiagonal_solve(lower, diag, upper, rhs) == pytest.approx(np.linalg.solve(A, rhs)), 'Niepoprawne rozwiązanie dla wielu prawych stron.'
+
+
+@pytest.mark.parametrize("check_every", [1, 5])
+def test_jacobi_check_every(check_every: int):
+    rng = np.random.default_rng(0)
+    A = rng.random((20, 20)) + 20 * np.eye(20)
+    b = rng.random(20)
+    x = main.jacobi(A, b, np.zeros(20), 1e-12, 300, check_every)
+    assert x == pytest.approx(np.linalg.solve(A, b)), 'Rozwiązanie metody Jacobiego różni się od np.linalg.solve.'
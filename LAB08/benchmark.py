@@ -0,0 +1,47 @@
+import time
+import numpy as np
+
+import main
+
+
+def measure(fun, *args, repeat: int = 3) -> float:
+    """Zwraca najkrótszy z repeat czasów wykonania fun(*args) w sekundach."""
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fun(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def roots_loop(coef: np.ndarray) -> list:
+    """Pierwiastki kolejnych wielomianów przez np.roots (wartości własne macierzy stowarzyszonej) - punkt odniesienia."""
+    return [np.roots(np.concatenate([[1], c])) for c in coef]
+
+
+def backward_error(coef: np.ndarray, z: np.ndarray) -> float:
+    """Największy względny błąd wsteczny |p(z)| / sum |a_j| |z|^j (w jednostkach eps) pierwiastków z (n,)
+    wielomianu x^n + c_1 x^(n-1) + ... + c_n; dla |z| > 1 liczony na wielomianie odwróconym, jak w frob_roots."""
+    full = np.concatenate([[1], coef])
+    err = 0.0
+    for root in z:
+        a, w = (full[::-1], 1 / root) if abs(root) > 1 else (full, root)
+        value, scale = abs(np.polyval(a, w)), np.polyval(np.abs(a), abs(w))
+        err = max(err, value / scale if scale > 0 else 0.0)
+    return err / np.finfo(float).eps
+
+
+if __name__ == '__main__':
+    rng = np.random.default_rng(0)
+    families = {'losowe współczynniki N(0, 1)': lambda k, n: rng.standard_normal((k, n)),
+                'wartości własne z U(0, 1)': lambda k, n: np.array([np.poly(e)[1:] for e in rng.random((k, n))])}
+    for name, family in families.items():
+        print(f'{name}; błąd wsteczny w jednostkach eps')
+        for k, n in [(1, 100), (1, 500), (1, 1000), (100, 100)]:
+            coef = family(k, n)
+            t_aberth = measure(main.frob_roots, coef, repeat=1)
+            t_roots = measure(roots_loop, coef, repeat=1)
+            err = max(map(backward_error, coef, main.frob_roots(coef)))
+            err_roots = max(map(backward_error, coef, roots_loop(coef)))
+            print(f'k = {k:3d}, n = {n:4d} | frob_roots: {t_aberth:7.3f} s, błąd {err:8.1f} | '
+                  f'np.roots: {t_roots:7.3f} s, błąd {err_roots:8.1f} | przyspieszenie: {t_roots / t_aberth:5.2f}x')
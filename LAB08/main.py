@@ -1,3 +1,5 @@
+import os
+import sys
 import numpy as np
 import scipy as sp
 from scipy import linalg
@@ -6,15 +8,34 @@ import pickle
 
 from typing import Union, List, Tuple
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import spawn_rngs, random_orthogonal
+
+# od tego stopnia czynników polly_from_egval mnoży wielomiany przez FFT
+_FFT_DEGREE = 64
+# maksymalna liczba elementów bloku różnic z_i - z_j w frob_roots
+_BLOCK_ELEMENTS = 2 ** 22
+# frob_roots kończy poprawianie pierwiastka, gdy |p(z)| <= _BACKWARD_FACTOR * n * eps * sum |c_i| |z|^i
+_BACKWARD_FACTOR = 4
+
 '''
 Do celów testowych dla elementów losowych uzywaj seed = 24122022
 '''
+# ziarno, z którym random_matrix_by_egval odtwarza wyniki testów
+_SEED = 24122022
 
 
-def random_matrix_by_egval(egval_vec: np.ndarray):
+def random_matrix_by_egval(egval_vec: np.ndarray, rng=None, method: str = 'random', cond: float = 1.0):
     """Funkcja z pierwszego zadania domowego
+    Macierz A = P diag(egval) P^-1 liczona bez odwracania P: A^T jest rozwiązaniem układu
+    P^T A^T = (P diag(egval))^T (jeden rozkład LU), a kolumny P skalowane są przez egval.
     Parameters:
-    egval_vec : wetkor wartości własnych
+    egval_vec : wetkor wartości własnych (n,) albo macierz (k,n) - k zestawów, wynik (k,n,n)
+    rng: ziarno albo np.random.Generator (np. z spawn_rngs); dla None lokalny generator z ziarnem
+         24122022 daje te same wartości co dawne np.random.seed(24122022) bez zmiany globalnego stanu
+    method: 'random' - P o elementach z [0, 1), 'orthogonal' - P = U diag(s) V^T, U, V losowe ortogonalne
+    cond: współczynnik uwarunkowania P dla method='orthogonal' (s od 1 do 1/cond); dla cond = 1
+          P jest ortogonalna i A = P diag(egval) P^T nie wymaga rozwiązywania układu
     Results:
     np.ndarray: losowa macierza o zadanych wartościach własnych 
                 Jeżeli dane wejściowe niepoprawne funkcja zwraca None
@@ -22,15 +43,29 @@ def random_matrix_by_egval(egval_vec: np.ndarray):
     try:
         if not isinstance(egval_vec, (np.ndarray, List)):
             raise TypeError
+        egval = np.asarray(egval_vec)
+        if egval.ndim not in (1, 2) or method not in ('random', 'orthogonal') or not cond >= 1:
+            raise TypeError
 
-        np.random.seed(24122022)
+        if rng is None:
+            rng = np.random.RandomState(_SEED)
+        else:
+            rng = np.random.default_rng(rng)
 
-        len_v = len(egval_vec)
-        jord = np.diag(egval_vec)
-        p = np.random.rand(len_v, len_v)
-        p_inv = np.linalg.inv(p)
-        a = p @ jord @ p_inv
-        return a
+        len_v = egval.shape[-1]
+        shape = egval.shape[:-1] + (len_v, len_v)
+        if method == 'random':
+            p = rng.random(shape)
+        else:
+            k = int(np.prod(egval.shape[:-1]))
+            u = random_orthogonal(k, len_v, rng).reshape(shape)
+            if cond == 1:
+                return (u * egval[..., np.newaxis, :]) @ np.swapaxes(u, -1, -2)
+            v = random_orthogonal(k, len_v, rng).reshape(shape)
+            p = (u * np.logspace(0, -np.log10(cond), len_v)) @ np.swapaxes(v, -1, -2)
+        # A^T = P^-T (P diag(egval))^T
+        pd = p * egval[..., np.newaxis, :]
+        return np.swapaxes(np.linalg.solve(np.swapaxes(p, -1, -2), np.swapaxes(pd, -1, -2)), -1, -2)
     except TypeError:
         return None
 
@@ -56,10 +91,192 @@ def frob_a(coef_vec: np.ndarray):
 
 def polly_from_egval(egval_vec: np.ndarray):
     """Funkcja z laboratorium 8
+    Wielomian charakterystyczny (x - l_1)(x - l_2)...(x - l_n) liczony drzewem iloczynów:
+    czynniki mnożone są parami, poziom po poziomie, dla wszystkich widm naraz.
+    Dla stopni od _FFT_DEGREE mnożenie wykonywane jest przez FFT.
+    Parameters:
+    egval_vec: wetkor wartości własnych (n,) albo macierz (k,n) - k zestawów wartości własnych
+    Results:
+    np.ndarray: wektor współczynników wielomianu charakterystycznego (n+1,) albo macierz (k,n+1),
+                od najwyższej potęgi, jak w np.poly (frob_a przyjmuje wynik bez pierwszego elementu)
+                Jeżeli dane wejściowe niepoprawne funkcja zwraca None
+    """
+    try:
+        if not isinstance(egval_vec, (np.ndarray, List)):
+            raise TypeError
+        roots = np.asarray(egval_vec)
+        if roots.ndim not in (1, 2) or roots.shape[-1] == 0 or not np.issubdtype(roots.dtype, np.number):
+            raise TypeError
+        batch = np.atleast_2d(roots)
+        dtype = complex if np.iscomplexobj(batch) else float
+        k, n = batch.shape
+        size = 1 << (n - 1).bit_length()
+        # liście drzewa: wielomiany (x - l_i) od najniższej potęgi, dopełnione wielomianami 1
+        level = np.zeros((k, size, 2), dtype=dtype)
+        level[:, :, 0] = 1
+        level[:, :n, 0] = -np.take_along_axis(batch, np.argsort(np.angle(batch) if dtype is complex else batch,
+                                                                axis=1), axis=1)
+        level[:, :n, 1] = 1
+        # permutacja bit-reverse: każde poddrzewo dostaje pierwiastki rozłożone po całym widmie,
+        # a nie sąsiednie, co ogranicza wzrost współczynników iloczynów częściowych
+        level = level[:, _bit_reverse(size)]
+        while level.shape[1] > 1:
+            level = _poly_multiply(level[:, 0::2], level[:, 1::2])
+        coef = level[:, 0, :n + 1][:, ::-1].copy()
+        coef[:, 0] = 1
+        if dtype is complex and np.all(np.sort(batch, axis=1) == np.sort(batch.conjugate(), axis=1)):
+            coef = coef.real.copy()
+        return coef if roots.ndim == 2 else coef[0]
+    except TypeError:
+        return None
+
+
+def _bit_reverse(size: int) -> np.ndarray:
+    """Permutacja odwracająca kolejność bitów indeksów 0..size-1 (size - potęga dwójki)"""
+    bits = max(size.bit_length() - 1, 0)
+    idx = np.arange(size)
+    rev = np.zeros(size, dtype=int)
+    for b in range(bits):
+        rev |= ((idx >> b) & 1) << (bits - 1 - b)
+    return rev
+
+
+def _poly_multiply(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Iloczyny par wielomianów a[..., :] * b[..., :] (współczynniki od najniższej potęgi,
+    ta sama długość d+1); wynik ma długość 2d+1"""
+    d = a.shape[-1] - 1
+    length = 2 * d + 1
+    if d < _FFT_DEGREE:
+        out = np.zeros(a.shape[:-1] + (length,), dtype=np.result_type(a, b))
+        for i in range(d + 1):
+            out[..., i:i + d + 1] += a[..., i:i + 1] * b
+        return out
+    nfft = 1 << (length - 1).bit_length()
+    if np.iscomplexobj(a) or np.iscomplexobj(b):
+        return np.fft.ifft(np.fft.fft(a, nfft) * np.fft.fft(b, nfft))[..., :length]
+    return np.fft.irfft(np.fft.rfft(a, nfft) * np.fft.rfft(b, nfft), nfft)[..., :length]
+
+
+def frob_roots(coef_vec: np.ndarray, tol: float = 1e-14, maxiter: int = 500):
+    """Pierwiastki wielomianu x^n + c_1 x^(n-1) + ... + c_n, czyli wartości własne macierzy frob_a(coef_vec),
+    bez budowania macierzy - wystarcza jej ostatni wiersz. Iteracja Abertha-Ehrlicha: O(n^2) operacji
+    na krok i O(n) pamięci na wielomian (sumy 1/(z_i - z_j) liczone blokami).
+    Pierwiastek przestaje być poprawiany, gdy jego błąd wsteczny jest na poziomie błędów zaokrągleń
+    (|p(z)| <= _BACKWARD_FACTOR * n * eps * sum |c_i| |z|^i, patrz _newton_step) albo gdy poprawka jest
+    względnie mniejsza od tol; kolejne kroki liczone są tylko dla pierwiastków jeszcze niezbieżnych.
     Parameters:
-    egval_vec: wetkor wartości własnych
+    coef_vec: wektor współczynników c_1..c_n (n,) w formacie frob_a albo macierz (k,n) - k wielomianów
+    tol: względna wielkość poprawki, poniżej której pierwiastek uznaje się za zbieżny
+    maxiter: maksymalna liczba iteracji
     Results:
-    np.ndarray: wektor współczynników wielomianu charakterystycznego
+    np.ndarray: zespolone pierwiastki (n,) albo (k,n)
                 Jeżeli dane wejściowe niepoprawne funkcja zwraca None
     """
-    return None
+    try:
+        if not isinstance(coef_vec, np.ndarray) or coef_vec.ndim not in (1, 2) or coef_vec.shape[-1] == 0:
+            raise TypeError
+        if not np.issubdtype(coef_vec.dtype, np.number) or not isinstance(maxiter, int) or maxiter < 1:
+            raise TypeError
+        coef = np.atleast_2d(coef_vec).astype(complex)
+        k, n = coef.shape
+        full = np.concatenate([np.ones((k, 1), dtype=complex), coef], axis=1)
+        z = _initial_roots(full)
+        tables = _power_tables(full)
+        active = np.ones((k, n), dtype=bool)
+        block = max(1, _BLOCK_ELEMENTS // n)
+        for _ in range(maxiter):
+            # liczone są tylko pierwiastki niezbieżne, sumy Abertha obejmują wszystkie pierwiastki wielomianu
+            rows, cols = np.nonzero(active)
+            if rows.size == 0:
+                break
+            za = z[rows, cols]
+            newton, settled = _newton_step(tables, rows, za)
+            s = np.empty_like(za)
+            for start in range(0, rows.size, block):
+                part = slice(start, start + block)
+                diff = za[part, None] - z[rows[part]]
+                diff[np.arange(diff.shape[0]), cols[part]] = np.inf
+                s[part] = (1 / diff).sum(axis=1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                delta = newton / (1 - newton * s)
+            delta = np.where(np.isfinite(delta), delta, 0)
+            z[rows, cols] = za - delta
+            active[rows, cols] = ~settled & (np.abs(delta) > tol * np.maximum(np.abs(za - delta), 1))
+        return z if coef_vec.ndim == 2 else z[0]
+    except TypeError:
+        return None
+
+
+def _initial_roots(full: np.ndarray) -> np.ndarray:
+    """Przybliżenia początkowe pierwiastków wielomianów full (k,n+1) metodą wielokąta Newtona (Bini):
+    dla każdej krawędzi [i, j] górnej otoczki wypukłej punktów (potęga, log|a|) j - i pierwiastków
+    leży na okręgu o promieniu (|a_i| / |a_j|)^(1/(j-i)); kąty przesunięte, by ominąć symetrie rzeczywiste.
+    Zerowe współczynniki najniższych potęg (pierwiastki zerowe) dostają mniejszy okrąg."""
+    k, n = full.shape[0], full.shape[1] - 1
+    with np.errstate(divide='ignore'):
+        log_a = np.log(np.abs(full[:, ::-1]))
+    z = np.empty((k, n), dtype=complex)
+    for row in range(k):
+        # otoczka liczona na liczbach Pythona - w pętli po n punktach indeksowanie tablic byłoby wolniejsze
+        y = log_a[row].tolist()
+        hull = []
+        for j in np.flatnonzero(np.isfinite(log_a[row])).tolist():
+            while len(hull) >= 2:
+                i0, i1 = hull[-2], hull[-1]
+                if (y[i1] - y[i0]) * (j - i0) > (y[j] - y[i0]) * (i1 - i0):
+                    break
+                hull.pop()
+            hull.append(j)
+        radii = [np.exp((y[i] - y[j]) / (j - i)) for i, j in zip(hull[:-1], hull[1:])]
+        counts = [hull[0]] + [j - i for i, j in zip(hull[:-1], hull[1:])]
+        radii = [min(radii, default=1.0) / 2] + radii
+        start = 0
+        for radius, count in zip(radii, counts):
+            angles = 2 * np.pi * (np.arange(count) / count + start / n) + 0.4
+            z[row, start:start + count] = max(radius, np.finfo(float).tiny) * np.exp(1j * angles)
+            start += count
+    return z
+
+
+def _power_tables(full: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Współczynniki wielomianów full (k,n+1) przy kolejnych potęgach w^0..w^n dla _newton_step:
+    tablice (2,k,n+1) - [0] dla p(z), [1] dla wielomianu odwróconego q(w) = w^n p(1/w) -
+    współczynników, współczynników pochodnej (j * a_j) i modułów współczynników"""
+    n = full.shape[1] - 1
+    coef = np.stack([full[:, ::-1], full])
+    return coef, coef * np.arange(n + 1), np.abs(coef)
+
+
+def _newton_step(tables: Tuple[np.ndarray, np.ndarray, np.ndarray], rows: np.ndarray,
+                 z: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Poprawki Newtona p(z)/p'(z) dla pierwiastków z (N,) wielomianów monicznych rows
+    (tables - wynik _power_tables) i maska pierwiastków o błędzie wstecznym na poziomie zaokrągleń:
+    |p(z)| <= _BACKWARD_FACTOR * n * eps * sum |c_i| |z|^i.
+    Dla |z| > 1 liczony jest wielomian odwrócony q(w) = w^n p(1/w), w = 1/z, więc zawsze |w| <= 1,
+    potęgi w nie przepełniają zakresu i wielomian liczony jest jako suma a_j w^j dla wszystkich
+    pierwiastków naraz (blokami po _BLOCK_ELEMENTS elementów)"""
+    coef, dcoef, acoef = tables
+    n = coef.shape[2] - 1
+    outer = np.abs(z) > 1
+    w = np.where(outer, 1 / np.where(outer, z, 1), z)
+    w_abs = np.abs(w)
+    table = outer.astype(int)
+    p = np.empty_like(z)
+    dp = np.empty_like(z)
+    p_abs = np.empty(z.shape)
+    block = max(1, _BLOCK_ELEMENTS // (n + 1))
+    for start in range(0, z.size, block):
+        part = slice(start, start + block)
+        m = w[part].size
+        powers = np.ones((m, n + 1), dtype=complex)
+        np.cumprod(np.broadcast_to(w[part, None], (m, n)), axis=1, out=powers[:, 1:])
+        powers_abs = np.ones((m, n + 1))
+        np.cumprod(np.broadcast_to(w_abs[part, None], (m, n)), axis=1, out=powers_abs[:, 1:])
+        key = (table[part], rows[part])
+        p[part] = np.einsum('ij,ij->i', coef[key], powers)
+        dp[part] = np.einsum('ij,ij->i', dcoef[key][:, 1:], powers[:, :-1])
+        p_abs[part] = np.einsum('ij,ij->i', acoef[key], powers_abs)
+    settled = np.abs(p) <= _BACKWARD_FACTOR * n * np.finfo(float).eps * p_abs
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        ratio = np.where(outer, w * (n - w * dp / p), dp / p)
+        return 1 / ratio, settled
@@ -33,3 +33,51 @@ def test_frob_a(coef_vec:np.ndarray, result):
     else:
         A = main.frob_a(coef_vec)
         assert A == pytest.approx(result), 'Spodziewany wynik: {0}, aktualny {1}. Błedy wejścia.'.format(result, main.frob_a(coef_vec))
+
+
+@pytest.mark.parametrize("egval_vec", [np.array([1.0, 2.0, 3.0]), np.linspace(-1, 1, 10), np.random.default_rng(0).random((4, 70)), np.array([2.0])])
+def test_polly_from_egval_vs_poly(egval_vec: np.ndarray):
+    result = main.polly_from_egval(egval_vec)
+    expected_coef = np.array([np.poly(v) for v in np.atleast_2d(egval_vec)]).reshape(result.shape)
+    scale = np.abs(expected_coef).max(axis=-1, keepdims=True)
+    assert result / scale == pytest.approx(expected_coef / scale, abs=1e-12), 'Spodziewany wynik: {0}, aktualny {1}.'.format(expected_coef, result)
+
+
+@pytest.mark.parametrize("egval_vec", [np.array([1.0, 2.0, 3.0]), np.array([[0.5, -0.5, 2.0, 4.0], [1.0, 1.5, 2.5, 3.0]]), np.linspace(-3, 3, 8)])
+def test_frob_roots_round_trip(egval_vec: np.ndarray):
+    coef = main.polly_from_egval(egval_vec)[..., 1:]
+    roots = main.frob_roots(coef)
+    assert roots.shape == egval_vec.shape, 'Niepoprawny kształt wyniku: {0}.'.format(roots.shape)
+    assert np.abs(roots.imag).max() < 1e-6, 'Pierwiastki powinny być rzeczywiste.'
+    assert np.sort(roots.real, axis=-1) == pytest.approx(np.sort(egval_vec, axis=-1), abs=1e-6), 'Pierwiastki różnią się od wartości własnych.'
+    eig = np.linalg.eigvals(main.frob_a(np.atleast_2d(coef)[0]))
+    assert np.sort(eig.real) == pytest.approx(np.sort(np.atleast_2d(egval_vec)[0]), abs=1e-6), 'Wartości własne frob_a różnią się od zadanych.'
+
+
+@pytest.mark.parametrize("n", [50, 200])
+def test_frob_roots_backward_error(n: int):
+    coef = np.random.default_rng(n).standard_normal((2, n))
+    roots = main.frob_roots(coef)
+    for c, z in zip(coef, roots):
+        full = np.concatenate([[1], c])
+        for root in z:
+            a, w = (full[::-1], 1 / root) if abs(root) > 1 else (full, root)
+            err = abs(np.polyval(a, w)) / np.polyval(np.abs(a), abs(w))
+            assert err < 100 * n * np.finfo(float).eps, 'Zbyt duży błąd wsteczny pierwiastka: {0}.'.format(err)
+        distance = np.abs(z[:, None] - np.roots(full)[None, :]).min(axis=1)
+        assert distance.max() < 1e-6, 'Pierwiastki różnią się od np.roots: {0}.'.format(distance.max())
+
+
+@pytest.mark.parametrize("method,cond", [('random', 1.0), ('orthogonal', 1.0), ('orthogonal', 1e3)])
+def test_random_matrix_by_egval_spectrum(method: str, cond: float):
+    egval_vec = np.array([1.0, 2.0, 5.0, 7.0])
+    A = main.random_matrix_by_egval(egval_vec, np.random.default_rng(0), method, cond)
+    assert np.sort(np.linalg.eigvals(A).real) == pytest.approx(egval_vec, rel=1e-6), 'Widmo macierzy różni się od zadanego.'
+
+
+def test_random_matrix_by_egval_batched():
+    egval_vec = np.array([[1.0, 2.0, 3.0], [-1.0, 0.5, 4.0]])
+    A = main.random_matrix_by_egval(egval_vec, np.random.default_rng(1), 'orthogonal')
+    assert A.shape == (2, 3, 3), 'Niepoprawny kształt wyniku: {0}.'.format(A.shape)
+    for k in range(2):
+        assert np.sort(np.linalg.eigvals(A[k]).real) == pytest.approx(egval_vec[k]), 'Widmo macierzy {0} różni się od zadanego.'.format(k)
@@ -1,16 +1,49 @@
+import os
+import sys
 import numpy as np
 import scipy as sp
+from scipy import sparse
+import scipy.sparse.linalg
+import scipy.sparse.csgraph
+import scipy.linalg
 import pickle
+import time
 import numpy.linalg as linalg
 
+from collections import OrderedDict, deque
 from typing import Union, List, Tuple, Optional
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from common import residual_norm, matrix_fingerprint, spawn_rngs, jacobi_iterations
 
-def diag_dominant_matrix_A_b(m: int) -> Tuple[np.ndarray, np.ndarray]:
+# układy do tego rozmiaru auto_solve rozwiązuje metodami bezpośrednimi
+_DIRECT_SIZE = 2000
+# liczba macierzy, dla których matrix_properties pamięta wyniki
+_PROPERTIES_CACHE_SIZE = 32
+# liczba iteracji próbnych CG, którymi cg_req szuka dowodu, że duża macierz nie jest dodatnio określona
+_SPD_PROBE_ITER = 100
+# auto_solve wybiera metodę Jacobiego tylko dla promienia spektralnego iteracji do _JACOBI_RHO
+# i przerywa ją po _JACOBI_MAXITER iteracjach na rzecz GMRES
+_JACOBI_RHO = 0.5
+_JACOBI_MAXITER = 100
+# liczba iteracji próbnych, którymi choose_sor_omega sprawdza oszacowanie omega
+_SOR_TRIAL = 10
+_properties_cache = OrderedDict()
+# historia wywołań auto_solve (metoda i czasy), ostatnie 1000 wpisów
+auto_solve_log = deque(maxlen=1000)
+
+
+def is_matrix(A) -> bool:
+    """Funkcja sprawdzająca czy A jest macierzą gęstą (np.ndarray) albo rzadką (scipy.sparse)"""
+    return isinstance(A, np.ndarray) or sparse.issparse(A)
+
+
+def diag_dominant_matrix_A_b(m: int, rng=None) -> Tuple[np.ndarray, np.ndarray]:
     """Funkcja tworząca zestaw składający się z macierzy A (m,m), wektora b (m,) o losowych wartościach całkowitych z przedziału 0, 9
     Macierz A ma być diagonalnie zdominowana, tzn. wyrazy na przekątnej sa wieksze od pozostałych w danej kolumnie i wierszu
     Parameters:
     m int: wymiary macierzy i wektora
+    rng: ziarno albo np.random.Generator (np. z spawn_rngs); globalny stan np.random nie jest używany
 
     Returns:
     Tuple[np.ndarray, np.ndarray]: macierz diagonalnie zdominowana o rozmiarze (m,m) i wektorem (m,)
@@ -19,8 +52,9 @@ def diag_dominant_matrix_A_b(m: int) -> Tuple[np.ndarray, np.ndarray]:
     try:
         if m <= 0:
             raise ValueError
-        a = np.random.randint(1, 100, (m, m))
-        b = np.random.randint(0, 9, (m,))
+        rng = np.random.default_rng(rng)
+        a = rng.integers(1, 100, (m, m))
+        b = rng.integers(0, 9, (m,))
         max = np.sum(a, axis=1) - np.diag(a)
         a = a + np.diag(max)
         return a, b
@@ -31,14 +65,14 @@ def diag_dominant_matrix_A_b(m: int) -> Tuple[np.ndarray, np.ndarray]:
 def is_diag_dominant(A: np.ndarray) -> bool:
     """Funkcja sprawdzająca czy macierzy A (m,m) jest diagonalnie zdominowana
     Parameters:
-    A np.ndarray: macierz wejściowa
+    A np.ndarray: macierz wejściowa (gęsta albo scipy.sparse - liczona bez zamiany na gęstą)
 
     Returns:
     bool: sprawdzenie warunku 
           Jeżeli dane wejściowe niepoprawne funkcja zwraca None
     """
     try:
-        if not isinstance(A, np.ndarray):
+        if not is_matrix(A):
             raise ValueError
         if len(A.shape) != 2:
             raise ValueError
@@ -46,8 +80,8 @@ def is_diag_dominant(A: np.ndarray) -> bool:
             raise ValueError
         if A.shape[0] == 1:
             return True
-        d = np.diag(A)
-        max = np.sum(A, axis=1) - d
+        d = A.diagonal()
+        max = np.asarray(A.sum(axis=1)).ravel() - d
         if np.all(d > max):
             return True
         else:
@@ -56,10 +90,11 @@ def is_diag_dominant(A: np.ndarray) -> bool:
         return None
 
 
-def symmetric_matrix_A_b(m: int) -> Tuple[np.ndarray, np.ndarray]:
+def symmetric_matrix_A_b(m: int, rng=None) -> Tuple[np.ndarray, np.ndarray]:
     """Funkcja tworząca zestaw składający się z macierzy A (m,m), wektora b (m,) o losowych wartościach całkowitych z przedziału 0, 9
     Parameters:
     m int: wymiary macierzy i wektora
+    rng: ziarno albo np.random.Generator (np. z spawn_rngs); globalny stan np.random nie jest używany
 
     Returns:
     Tuple[np.ndarray, np.ndarray]: symetryczną macierz o rozmiarze (m,m) i wektorem (m,)
@@ -68,8 +103,9 @@ def symmetric_matrix_A_b(m: int) -> Tuple[np.ndarray, np.ndarray]:
     try:
         if m <= 0:
             raise ValueError
-        a = np.random.randint(1, 100, (m, m))
-        b = np.random.randint(0, 9, (m,))
+        rng = np.random.default_rng(rng)
+        a = rng.integers(1, 100, (m, m))
+        b = rng.integers(0, 9, (m,))
         a = np.tril(a)
         a = a + a.T
         return a, b
@@ -80,14 +116,14 @@ def symmetric_matrix_A_b(m: int) -> Tuple[np.ndarray, np.ndarray]:
 def is_symmetric(A: np.ndarray) -> bool:
     """Funkcja sprawdzająca czy macierzy A (m,m) jest symetryczna
     Parameters:
-    A np.ndarray: macierz wejściowa
+    A np.ndarray: macierz wejściowa (gęsta albo scipy.sparse - porównywane są tylko niezerowe elementy)
 
     Returns:
     bool: sprawdzenie warunku 
           Jeżeli dane wejściowe niepoprawne funkcja zwraca None
     """
     try:
-        if not isinstance(A, np.ndarray):
+        if not is_matrix(A):
             raise ValueError
         if len(A.shape) != 2:
             raise ValueError
@@ -95,6 +131,8 @@ def is_symmetric(A: np.ndarray) -> bool:
             raise ValueError
         if A.shape[0] == 1:
             return True
+        if sparse.issparse(A):
+            return (A != A.T).nnz == 0
         if np.all(A - A.T == 0):
             return True
         else:
@@ -104,14 +142,16 @@ def is_symmetric(A: np.ndarray) -> bool:
 
 
 def solve_jacobi(A: np.ndarray, b: np.ndarray, x_init: np.ndarray,
-                 epsilon: Optional[float] = 1e-8, maxiter: Optional[int] = 100) -> Tuple[np.ndarray, int]:
-    """Funkcja tworząca zestaw składający się z macierzy A (m,m), wektora b (m,) o losowych wartościach całkowitych
+                 epsilon: Optional[float] = 1e-8, maxiter: Optional[int] = 100,
+                 check_every: Optional[int] = 1) -> Tuple[np.ndarray, int]:
+    """Funkcja rozwiązująca układ równań Ax = b metodą Jacobiego
     Parameters:
-    A np.ndarray: macierz współczynników
+    A np.ndarray: macierz współczynników (gęsta albo scipy.sparse)
     b np.ndarray: wektor wartości prawej strony układu
     x_init np.ndarray: rozwiązanie początkowe
     epsilon Optional[float]: zadana dokładność
     maxiter Optional[int]: ograniczenie iteracji
+    check_every Optional[int]: co ile iteracji sprawdzany jest warunek stopu
 
     Returns:
     np.ndarray: przybliżone rozwiązanie (m,)
@@ -119,59 +159,400 @@ def solve_jacobi(A: np.ndarray, b: np.ndarray, x_init: np.ndarray,
     int: iteracja
     """
     try:
-        if not isinstance(A, np.ndarray):
+        if not is_matrix(A):
             raise ValueError
         if A.shape[0] != A.shape[1] or len(b) != A.shape[0] or maxiter < 1:
             raise ValueError
-        D = np.diag(np.diag(A))
-        LU = A - D
-        x = x_init
-        D_inv = np.diag(1 / np.diag(D))
-        resid = []
-        for i in range(maxiter):
-            x_new = np.dot(D_inv, b - np.dot(LU, x))
+        return jacobi_iterations(A, b, x_init, epsilon, maxiter, check_every)
+    except (ValueError, TypeError):
+        return None
+
+
+def solve_gauss_seidel(A: np.ndarray, b: np.ndarray, x_init: np.ndarray,
+                       epsilon: Optional[float] = 1e-8, maxiter: Optional[int] = 100,
+                       check_every: Optional[int] = 1) -> Tuple[np.ndarray, int]:
+    """Funkcja rozwiązująca układ równań Ax = b metodą Gaussa-Seidla (SOR z omega = 1)
+    Parameters:
+    A np.ndarray: macierz współczynników (gęsta albo scipy.sparse)
+    b np.ndarray: wektor wartości prawej strony układu
+    x_init np.ndarray: rozwiązanie początkowe
+    epsilon Optional[float]: zadana dokładność
+    maxiter Optional[int]: ograniczenie iteracji
+    check_every Optional[int]: co ile iteracji sprawdzany jest warunek stopu
+
+    Returns:
+    np.ndarray: przybliżone rozwiązanie (m,)
+                Jeżeli dane wejściowe niepoprawne funkcja zwraca None
+    int: iteracja
+    """
+    return solve_sor(A, b, x_init, epsilon, maxiter, omega=1.0, check_every=check_every)
+
+
+def solve_sor(A: np.ndarray, b: np.ndarray, x_init: np.ndarray,
+              epsilon: Optional[float] = 1e-8, maxiter: Optional[int] = 100,
+              omega: Union[float, str] = 1.0, check_every: Optional[int] = 1) -> Tuple[np.ndarray, int]:
+    """Funkcja rozwiązująca układ równań Ax = b metodą nadrelaksacji (SOR)
+    Parameters:
+    A np.ndarray: macierz współczynników (gęsta albo scipy.sparse)
+    b np.ndarray: wektor wartości prawej strony układu
+    x_init np.ndarray: rozwiązanie początkowe
+    epsilon Optional[float]: zadana dokładność
+    maxiter Optional[int]: ograniczenie iteracji
+    omega Union[float, str]: parametr relaksacji z przedziału (0, 2), domyślnie 1 (Gauss-Seidel),
+                             albo 'auto' - wtedy wybierany przez choose_sor_omega
+    check_every Optional[int]: co ile iteracji sprawdzany jest warunek stopu
+
+    Returns:
+    np.ndarray: przybliżone rozwiązanie (m,)
+                Jeżeli dane wejściowe niepoprawne funkcja zwraca None
+    int: iteracja
+    """
+    try:
+        if not is_matrix(A):
+            raise ValueError
+        if A.shape[0] != A.shape[1] or len(b) != A.shape[0] or maxiter < 1:
+            raise ValueError
+        if omega == 'auto':
+            omega = choose_sor_omega(A, b, x_init)
+        if not 0 < omega < 2:
+            raise ValueError
+        return sor_iterations(A, b, x_init, omega, epsilon, maxiter, check_every)
+    except (ValueError, TypeError):
+        return None
+
+
+def sor_iterations(A, b: np.ndarray, x_init: np.ndarray, omega: float = 1.0, epsilon: float = 1e-8,
+                   maxiter: int = 100, check_every: int = 1) -> Tuple[np.ndarray, List[float]]:
+    """Iteracja SOR zapisana jako x_new = x + (D/omega + L)^-1 (b - Ax).
+    Każda iteracja to jedno mnożenie macierz-wektor i jedno rozwiązanie układu trójkątnego
+    (przejście po wierszach wykonywane przez LAPACK albo, dla scipy.sparse, po wierszach CSR).
+
+    Parameters:
+    A: macierz współczynników (m,m)
+    b np.ndarray: wektor wartości prawej strony układu (m,)
+    x_init np.ndarray: rozwiązanie początkowe (m,)
+    omega float: parametr relaksacji
+    epsilon float: zadana dokładność normy ||x_new - x||
+    maxiter int: ograniczenie iteracji
+    check_every int: co ile iteracji liczona jest norma ||x_new - x|| (i warunek stopu)
+
+    Returns:
+    np.ndarray: przybliżone rozwiązanie (m,)
+    List[float]: normy ||x_new - x|| z iteracji, w których sprawdzano warunek stopu
+    """
+    if check_every < 1:
+        raise ValueError
+    if sparse.issparse(A):
+        M = (sparse.tril(A, k=-1) + sparse.diags(A.diagonal() / omega)).tocsr()
+        solve_lower = lambda r: sparse.linalg.spsolve_triangular(M, r, lower=True)
+    else:
+        M = np.tril(A, k=-1) + np.diag(np.diag(A) / omega)
+        solve_lower = lambda r: sp.linalg.solve_triangular(M, r, lower=True)
+    x = x_init
+    resid = []
+    for i in range(maxiter):
+        x_new = x + solve_lower(b - A @ x)
+        if (i + 1) % check_every == 0 or i == maxiter - 1:
             r_norm = np.linalg.norm(x_new - x)
             resid.append(r_norm)
             if r_norm < epsilon:
                 return x_new, resid
-            x = x_new
-        return x, resid
+        x = x_new
+    return x, resid
+
+
+def choose_sor_omega(A, b: np.ndarray, x_init: np.ndarray, n_trial: int = _SOR_TRIAL) -> float:
+    """Wybór parametru relaksacji dla solve_sor(omega='auto'). Wzór Younga (estimate_sor_omega)
+    jest optymalny tylko dla macierzy zgodnie uporządkowanych, więc oszacowanie jest sprawdzane:
+    po n_trial iteracjach próbnych z omega z estimate_sor_omega i z omega = 1 (Gauss-Seidel)
+    wybierany jest parametr o mniejszym współczynniku zbieżności (średnim ilorazie kolejnych
+    norm poprawek ||x_new - x|| w drugiej połowie prób - same normy poprawek są dla większego
+    omega na początku większe).
+
+    Parameters:
+    A: macierz współczynników (m,m), gęsta albo scipy.sparse
+    b np.ndarray: wektor wartości prawej strony układu
+    x_init np.ndarray: rozwiązanie początkowe
+    n_trial int: liczba iteracji próbnych dla każdego parametru
+
+    Returns:
+    float: parametr relaksacji z przedziału [1, 2)
+    """
+    omega = estimate_sor_omega(A)
+    if omega == 1.0:
+        return omega
+    _, resid_young = sor_iterations(A, b, x_init, omega, 0, n_trial)
+    _, resid_gs = sor_iterations(A, b, x_init, 1.0, 0, n_trial)
+    return omega if _contraction(resid_young) < _contraction(resid_gs) else 1.0
+
+
+def _contraction(resid: List[float]) -> float:
+    """Średni iloraz kolejnych norm poprawek w drugiej połowie listy resid"""
+    half = len(resid) // 2
+    if resid[-1] == 0:
+        return 0.0
+    return (resid[-1] / resid[half - 1]) ** (1 / (len(resid) - half))
+
+
+def estimate_sor_omega(A, n_iter: int = 50) -> float:
+    """Oszacowanie optymalnego parametru relaksacji omega = 2 / (1 + sqrt(1 - rho^2)),
+    gdzie rho to promień spektralny macierzy iteracji Jacobiego (jacobi_spectral_radius).
+    Dla rho >= 1 zwracane jest omega = 1 (Gauss-Seidel).
+
+    Parameters:
+    A: macierz współczynników (m,m), gęsta albo scipy.sparse
+    n_iter int: liczba iteracji metody potęgowej
+
+    Returns:
+    float: parametr relaksacji z przedziału [1, 2)
+    """
+    rho = jacobi_spectral_radius(A, n_iter)
+    if rho >= 1:
+        return 1.0
+    return 2 / (1 + np.sqrt(1 - rho ** 2))
+
+
+def jacobi_spectral_radius(A, n_iter: int = 50) -> float:
+    """Promień spektralny macierzy iteracji Jacobiego I - D^-1 A szacowany metodą potęgową.
+
+    Parameters:
+    A: macierz współczynników (m,m), gęsta albo scipy.sparse, z niezerową przekątną
+    n_iter int: liczba iteracji metody potęgowej
+
+    Returns:
+    float: oszacowanie promienia spektralnego
+    """
+    d = A.diagonal()
+    v = np.random.default_rng(0).random(A.shape[0])
+    rho = 0.0
+    for _ in range(n_iter):
+        w = v - (A @ v) / d
+        norm_w = np.linalg.norm(w)
+        if norm_w == 0:
+            return 0.0
+        rho = norm_w / np.linalg.norm(v)
+        v = w / norm_w
+    return rho
+
+
+def solve_cg(A, b: np.ndarray, x_init: np.ndarray, epsilon: Optional[float] = 1e-8,
+             maxiter: Optional[int] = 100, preconditioner: Optional[str] = None) -> Tuple[np.ndarray, int]:
+    """Funkcja rozwiązująca układ równań Ax = b (A symetryczna, dodatnio określona)
+    metodą gradientów sprzężonych z opcjonalnym ściskaniem (PCG)
+    Parameters:
+    A: macierz współczynników - gęsta, scipy.sparse albo operator z atrybutami shape i matvec
+    b np.ndarray: wektor wartości prawej strony układu
+    x_init np.ndarray: rozwiązanie początkowe
+    epsilon Optional[float]: zadana dokładność normy residuum ||b - Ax||
+    maxiter Optional[int]: ograniczenie iteracji
+    preconditioner Optional[str]: None, 'jacobi' albo 'ilu0' (patrz make_preconditioner)
+
+    Returns:
+    np.ndarray: przybliżone rozwiązanie (m,)
+                Jeżeli dane wejściowe niepoprawne funkcja zwraca None
+    List[float]: normy residuum ||b - Ax|| z kolejnych iteracji
+    """
+    try:
+        matvec, b, x, shape = _krylov_setup(A, b, x_init, maxiter)
+        precond = make_preconditioner(A, preconditioner)
+        r = b - matvec(x)
+        z = precond(r)
+        p = z
+        rz = r @ z
+        resid = []
+        for i in range(maxiter):
+            if np.linalg.norm(r) < epsilon:
+                break
+            Ap = matvec(p)
+            alpha = rz / (p @ Ap)
+            x = x + alpha * p
+            r = r - alpha * Ap
+            resid.append(np.linalg.norm(r))
+            z = precond(r)
+            rz_new = r @ z
+            p = z + (rz_new / rz) * p
+            rz = rz_new
+        return x.reshape(shape), resid
     except (ValueError, TypeError):
         return None
 
 
-def random_matrix_Ab(m: int):
-    """Funkcja tworząca zestaw składający się z macierzy A (m,m) i wektora b (m,)  zawierających losowe wartości
+def solve_gmres(A, b: np.ndarray, x_init: np.ndarray, epsilon: Optional[float] = 1e-8,
+                maxiter: Optional[int] = 100, restart: Optional[int] = 20,
+                preconditioner: Optional[str] = None) -> Tuple[np.ndarray, int]:
+    """Funkcja rozwiązująca układ równań Ax = b metodą GMRES z restartem co restart iteracji
+    i opcjonalnym prawostronnym ściskaniem (residuum jest więc residuum układu oryginalnego)
     Parameters:
-    m(int): rozmiar macierzy
-    Results:
-    (np.ndarray, np.ndarray): macierz o rozmiarze (m,m) i wektorem (m,)
+    A: macierz współczynników - gęsta, scipy.sparse albo operator z atrybutami shape i matvec
+    b np.ndarray: wektor wartości prawej strony układu
+    x_init np.ndarray: rozwiązanie początkowe
+    epsilon Optional[float]: zadana dokładność normy residuum ||b - Ax||
+    maxiter Optional[int]: ograniczenie łącznej liczby iteracji (mnożeń przez A)
+    restart Optional[int]: wymiar podprzestrzeni Kryłowa przed restartem
+    preconditioner Optional[str]: None, 'jacobi' albo 'ilu0' (patrz make_preconditioner)
+
+    Returns:
+    np.ndarray: przybliżone rozwiązanie (m,)
                 Jeżeli dane wejściowe niepoprawne funkcja zwraca None
+    List[float]: normy residuum ||b - Ax|| z kolejnych iteracji
     """
     try:
-        a1 = np.random.rand(m, m)
-        a2 = np.random.rand(m)
+        matvec, b, x, shape = _krylov_setup(A, b, x_init, maxiter)
+        if not isinstance(restart, int) or restart < 1:
+            raise ValueError
+        precond = make_preconditioner(A, preconditioner)
+        n = b.shape[0]
+        resid = []
+        while len(resid) < maxiter:
+            r = b - matvec(x)
+            beta = np.linalg.norm(r)
+            if beta < epsilon:
+                break
+            m = min(restart, maxiter - len(resid))
+            V = np.zeros((m + 1, n))
+            H = np.zeros((m + 1, m))
+            cs = np.zeros(m)
+            sn = np.zeros(m)
+            g = np.zeros(m + 1)
+            g[0] = beta
+            V[0] = r / beta
+            for j in range(m):
+                w = matvec(precond(V[j]))
+                # klasyczny Gram-Schmidt z reortogonalizacją
+                for _ in range(2):
+                    h = V[:j + 1] @ w
+                    w = w - V[:j + 1].T @ h
+                    H[:j + 1, j] += h
+                H[j + 1, j] = np.linalg.norm(w)
+                breakdown = H[j + 1, j] == 0
+                if not breakdown:
+                    V[j + 1] = w / H[j + 1, j]
+                # obroty Givensa sprowadzające H do postaci trójkątnej
+                for i in range(j):
+                    H[i, j], H[i + 1, j] = (cs[i] * H[i, j] + sn[i] * H[i + 1, j],
+                                            -sn[i] * H[i, j] + cs[i] * H[i + 1, j])
+                denom = np.hypot(H[j, j], H[j + 1, j])
+                cs[j], sn[j] = H[j, j] / denom, H[j + 1, j] / denom
+                H[j, j], H[j + 1, j] = denom, 0.0
+                g[j + 1] = -sn[j] * g[j]
+                g[j] = cs[j] * g[j]
+                resid.append(abs(g[j + 1]))
+                if resid[-1] < epsilon or breakdown:
+                    break
+            k = j + 1
+            y = sp.linalg.solve_triangular(H[:k, :k], g[:k])
+            x = x + precond(V[:k].T @ y)
+            if resid[-1] < epsilon:
+                break
+        return x.reshape(shape), resid
     except (ValueError, TypeError):
         return None
-    return a1, a2
 
 
-def residual_norm(A: np.ndarray, x: np.ndarray, b: np.ndarray):
-    """Funkcja obliczająca normę residuum dla równania postaci:
-    Ax = b
+def make_preconditioner(A, kind: Optional[str] = None):
+    """Funkcja tworząca funkcję ściskającą r -> M^-1 r dla metod Kryłowa
+    Parameters:
+    A: macierz współczynników (m,m)
+    kind Optional[str]: rodzaj ściskania:
+        - None -> brak (M = I)
+        - 'jacobi' -> M = diag(A); wymaga metody diagonal()
+        - 'ilu0' -> niepełny rozkład LU bez wypełnienia (ilu0) dla macierzy rzadkich;
+                    dla gęstych, bez zer, ILU(0) to pełny rozkład LU
 
-      Parameters:
-      A: macierz A (m,m) zawierająca współczynniki równania
-      x: wektor x (m.) zawierający rozwiązania równania
-      b: wektor b (m,) zawierający współczynniki po prawej stronie równania
+    Returns:
+    Callable: funkcja r -> M^-1 r
+    """
+    if kind is None:
+        return lambda r: r
+    if kind == 'jacobi':
+        if not hasattr(A, 'diagonal'):
+            raise ValueError
+        d = A.diagonal()
+        if np.any(d == 0):
+            raise ValueError
+        return lambda r: r / d
+    if kind == 'ilu0':
+        if sparse.issparse(A):
+            L, U = ilu0(A)
+            return lambda r: sparse.linalg.spsolve_triangular(
+                U, sparse.linalg.spsolve_triangular(L, r, lower=True, unit_diagonal=True), lower=False)
+        if isinstance(A, np.ndarray):
+            lu = sp.linalg.lu_factor(A)
+            return lambda r: sp.linalg.lu_solve(lu, r)
+    raise ValueError
+
+
+def ilu0(A) -> Tuple[sparse.csr_matrix, sparse.csr_matrix]:
+    """Niepełny rozkład LU bez wypełnienia (ILU(0)): czynniki mają te same niezerowe
+    pozycje co A. Dla macierzy symetrycznej U = D L^T, więc M = LU jest symetryczna
+    i nadaje się do ściskania metody CG.
+
+    Parameters:
+    A: macierz rzadka (m,m) z niezerową przekątną
+
+    Returns:
+    (sparse.csr_matrix, sparse.csr_matrix): L z jedynkami na przekątnej (niezapisanymi) i U
+    """
+    A = sparse.csr_matrix(A, dtype=float, copy=True)
+    A.sum_duplicates()
+    A.sort_indices()
+    n = A.shape[0]
+    indptr, indices, data = A.indptr, A.indices, A.data
+    diag_pos = np.full(n, -1)
+    rows = np.repeat(np.arange(n), np.diff(indptr))
+    on_diag = np.flatnonzero(indices == rows)
+    diag_pos[rows[on_diag]] = on_diag
+    if np.any(diag_pos < 0):
+        raise ValueError
+    position = np.full(n, -1)
+    for i in range(n):
+        start, end = indptr[i], indptr[i + 1]
+        position[indices[start:end]] = np.arange(start, end)
+        for p in range(start, diag_pos[i]):
+            k = indices[p]
+            data[p] /= data[diag_pos[k]]
+            upper_k = slice(diag_pos[k] + 1, indptr[k + 1])
+            pos = position[indices[upper_k]]
+            hit = pos >= 0
+            data[pos[hit]] -= data[p] * data[upper_k][hit]
+        position[indices[start:end]] = -1
+    return sparse.tril(A, k=-1, format='csr'), sparse.triu(A, format='csr')
 
-      Results:
-      (float)- wartość normy residuom dla podanych parametrów"""
+
+def _krylov_setup(A, b, x_init, maxiter):
+    """Wspólne sprawdzenie danych dla solve_cg i solve_gmres; zwraca funkcję mnożenia przez A,
+    wektory b i x w postaci (m,) oraz kształt wyniku"""
+    if is_matrix(A):
+        matvec = lambda v: A @ v
+    elif hasattr(A, 'matvec') and hasattr(A, 'shape'):
+        matvec = A.matvec
+    else:
+        raise ValueError
+    if len(A.shape) != 2 or A.shape[0] != A.shape[1]:
+        raise ValueError
+    if not isinstance(b, np.ndarray) or not isinstance(x_init, np.ndarray):
+        raise ValueError
+    if b.size != A.shape[0] or x_init.size != A.shape[0] or maxiter < 1:
+        raise ValueError
+    return matvec, b.astype(float).ravel(), x_init.astype(float).ravel(), x_init.shape
+
+
+def random_matrix_Ab(m: int, rng=None):
+    """Funkcja tworząca zestaw składający się z macierzy A (m,m) i wektora b (m,)  zawierających losowe wartości
+    Parameters:
+    m(int): rozmiar macierzy
+    rng: ziarno albo np.random.Generator (np. z spawn_rngs); globalny stan np.random nie jest używany
+    Results:
+    (np.ndarray, np.ndarray): macierz o rozmiarze (m,m) i wektorem (m,)
+                Jeżeli dane wejściowe niepoprawne funkcja zwraca None
+    """
     try:
-        rn = linalg.norm(b - A @ x)
-        return rn
-    except ValueError:
+        rng = np.random.default_rng(rng)
+        a1 = rng.random((m, m))
+        a2 = rng.random(m)
+    except (ValueError, TypeError):
         return None
+    return a1, a2
 
 
 def solve_req(A: np.ndarray) -> bool:
@@ -188,19 +569,196 @@ def jacobi_req(A: np.ndarray) -> bool:
         return False
 
 
-def cg_req(A: np.ndarray) -> bool:
+def cg_req(A: np.ndarray) -> Optional[bool]:
+    """Sprawdzenie czy macierz jest symetryczna i dodatnio określona (warunek metody CG).
+    Zwracane True i False są udowodnione, None oznacza wynik nierozstrzygnięty:
+    - True: kryterium Gerszgorina (przekątna większa od sumy modułów pozostałych elementów wiersza),
+      nieprzywiedlna dominacja przekątniowa (słaba we wszystkich wierszach i ścisła w co najmniej
+      jednym wierszu każdej składowej spójnej grafu macierzy), albo - dla macierzy gęstych
+      do _DIRECT_SIZE - rozkład Cholesky'ego;
+    - False: brak symetrii, niedodatni element przekątnej albo - dla macierzy rzadkich - kierunek
+      o niedodatniej krzywiźnie znaleziony w _SPD_PROBE_ITER iteracjach CG (_cg_curvature_positive);
+    - None: pozostałe macierze - duże gęste i rzadkie, których nie rozstrzygają testy O(nnz).
+    Pamięć O(nnz), dla dużych macierzy bez rozkładów O(m^3)."""
     if is_symmetric(A) == True:
-        try:
-            np.linalg.cholesky(A)
+        d = A.diagonal()
+        if np.any(d <= 0):
+            return False
+        radius = np.asarray(abs(A).sum(axis=1)).ravel() - np.abs(d)
+        if np.all(d > radius):
             return True
-        except np.linalg.LinAlgError:
+        if np.all(d >= radius) and _irreducibly_dominant(A, d > radius):
+            return True
+        if not sparse.issparse(A) and A.shape[0] <= _DIRECT_SIZE:
+            try:
+                np.linalg.cholesky(A)
+                return True
+            except np.linalg.LinAlgError:
+                return False
+        if sparse.issparse(A) and not _cg_curvature_positive(A, _SPD_PROBE_ITER):
             return False
+        return None
     else:
         return False
 
 
+def _irreducibly_dominant(A, strict: np.ndarray) -> bool:
+    """Czy każda składowa spójna grafu niezerowych elementów A zawiera wiersz ściśle dominujący
+    (strict). Dla symetrycznej, słabo diagonalnie zdominowanej macierzy o dodatniej przekątnej
+    oznacza to nieosobliwość (twierdzenie Taussky), a więc dodatnią określoność."""
+    if not np.any(strict):
+        return False
+    n_comp, labels = sparse.csgraph.connected_components(sparse.csr_matrix(A), directed=False)
+    return bool(np.all(np.bincount(labels, weights=strict, minlength=n_comp) > 0))
+
+
+def _cg_curvature_positive(A, n_iter: int) -> bool:
+    """Próba n_iter iteracji CG dla losowej prawej strony: zwraca False, gdy p^T A p <= 0
+    dla któregoś kierunku (A nie jest dodatnio określona), w przeciwnym razie True.
+    Wynik True niczego nie dowodzi - macierz bliska nieokreślonej może przejść próbę."""
+    r = np.random.default_rng(0).standard_normal(A.shape[0])
+    p = r.copy()
+    rr = r @ r
+    for _ in range(n_iter):
+        Ap = A @ p
+        curvature = p @ Ap
+        if curvature <= 0:
+            return False
+        r -= rr / curvature * Ap
+        rr_new = r @ r
+        if rr_new == 0:
+            break
+        p = r + rr_new / rr * p
+        rr = rr_new
+    return True
+
+
 def gmres_req(A: np.ndarray) -> bool:
     if A.shape[0] == A.shape[1]:
         return True
     else:
         return False
+
+
+def matrix_properties(A) -> dict:
+    """Własności macierzy potrzebne do wyboru metody (solve_req, cg_req, jacobi_req, rozmiar,
+    rzadkość). 'spd' może mieć wartość None, gdy cg_req nie rozstrzyga dodatniej określoności. Wyniki są zapamiętywane dla ostatnich _PROPERTIES_CACHE_SIZE macierzy,
+    rozpoznawanych po matrix_fingerprint.
+
+    Parameters:
+    A: macierz gęsta albo scipy.sparse
+
+    Returns:
+    dict: słownik własności macierzy
+    """
+    key = matrix_fingerprint(A)
+    if key in _properties_cache:
+        _properties_cache.move_to_end(key)
+        return _properties_cache[key]
+    square = solve_req(A)
+    props = {
+        'square': square,
+        'size': A.shape[0],
+        'sparse': sparse.issparse(A),
+        'nnz': A.nnz if sparse.issparse(A) else np.count_nonzero(A),
+        'spd': square and cg_req(A),
+        'diag_dominant': square and jacobi_req(A),
+    }
+    # promień spektralny Jacobiego potrzebny tylko przy wyborze metody iteracyjnej
+    big = props['size'] > _DIRECT_SIZE
+    props['jacobi_rho'] = jacobi_spectral_radius(A) if props['diag_dominant'] and big else None
+    _properties_cache[key] = props
+    if len(_properties_cache) > _PROPERTIES_CACHE_SIZE:
+        _properties_cache.popitem(last=False)
+    return props
+
+
+def choose_method(props: dict) -> str:
+    """Wybór metody na podstawie własności z matrix_properties:
+    małe układy - rozkład Cholesky'ego (SPD) albo LU, duże - CG (tylko dla udowodnionej SPD, spd is True),
+    Jacobi (diagonalnie zdominowane, o promieniu spektralnym Jacobiego do _JACOBI_RHO,
+    czyli szybko zbieżne) albo GMRES (pozostałe)"""
+    if props['size'] <= _DIRECT_SIZE:
+        return 'cholesky' if props['spd'] is True and not props['sparse'] else 'lu'
+    if props['spd'] is True:
+        return 'cg'
+    if props['diag_dominant'] and props.get('jacobi_rho') is not None and props['jacobi_rho'] <= _JACOBI_RHO:
+        return 'jacobi'
+    return 'gmres'
+
+
+def _direct_solve(A, b: np.ndarray) -> np.ndarray:
+    """Rozwiązanie układu Ax = b rozkładem LU (spsolve dla macierzy rzadkich)"""
+    if sparse.issparse(A):
+        return sparse.linalg.spsolve(sparse.csc_matrix(A), b).reshape(b.shape)
+    return sp.linalg.lu_solve(sp.linalg.lu_factor(A), b)
+
+
+def auto_solve(A, b: np.ndarray, x_init: Optional[np.ndarray] = None, epsilon: Optional[float] = 1e-8,
+               maxiter: Optional[int] = 1000) -> Tuple[np.ndarray, dict]:
+    """Funkcja rozwiązująca układ Ax = b metodą dobraną automatycznie (choose_method).
+    Jeżeli metoda Jacobiego nie osiągnie zadanej dokładności w _JACOBI_MAXITER iteracjach,
+    układ jest rozwiązywany metodą GMRES. Po każdej metodzie iteracyjnej sprawdzana jest
+    norma residuum ||b - Ax||; gdy przekracza epsilon, układ jest rozwiązywany metodą
+    bezpośrednią (LU), a do nazwy metody dopisywane jest '+lu'.
+    Każde wywołanie jest zapisywane w auto_solve_log.
+
+    Parameters:
+    A: macierz współczynników (m,m), gęsta albo scipy.sparse
+    b np.ndarray: wektor wartości prawej strony układu
+    x_init Optional[np.ndarray]: rozwiązanie początkowe metod iteracyjnych, domyślnie zera
+    epsilon Optional[float]: zadana dokładność metod iteracyjnych
+    maxiter Optional[int]: ograniczenie iteracji metod iteracyjnych
+
+    Returns:
+    np.ndarray: rozwiązanie (m,)
+                Jeżeli dane wejściowe niepoprawne funkcja zwraca None
+    dict: informacje o wywołaniu - 'method', 'setup_time', 'solve_time', 'resid'
+          (normy residuum, ostatnia to norma zwracanego rozwiązania) i 'converged'
+    """
+    try:
+        if not is_matrix(A) or not isinstance(b, np.ndarray):
+            raise ValueError
+        if len(A.shape) != 2 or A.shape[0] != A.shape[1] or b.shape[0] != A.shape[0]:
+            raise ValueError
+        if x_init is None:
+            x_init = np.zeros(b.shape)
+        start = time.perf_counter()
+        if not np.issubdtype(A.dtype, np.inexact):
+            # mnożenie macierzy całkowitoliczbowych nie korzysta z BLAS
+            A = A.astype(float)
+        method = choose_method(matrix_properties(A))
+        setup_time = time.perf_counter() - start
+
+        # ściskanie Jacobiego wymaga niezerowej przekątnej; w przeciwnym razie metody Kryłowa bez ściskania
+        precond = 'jacobi' if np.all(A.diagonal() != 0) else None
+
+        start = time.perf_counter()
+        if method == 'cholesky':
+            x = sp.linalg.cho_solve(sp.linalg.cho_factor(A), b)
+            resid = [residual_norm(A, x, b)]
+        elif method == 'lu':
+            x = _direct_solve(A, b)
+            resid = [residual_norm(A, x, b)]
+        elif method == 'cg':
+            x, resid = solve_cg(A, b, x_init, epsilon, maxiter, preconditioner=precond)
+        elif method == 'jacobi':
+            x, resid = solve_jacobi(A, b, x_init, epsilon, min(maxiter, _JACOBI_MAXITER))
+            if resid[-1] >= epsilon:
+                method = 'jacobi+gmres'
+                x, resid = solve_gmres(A, b, x_init, epsilon, maxiter, preconditioner=precond)
+        else:
+            x, resid = solve_gmres(A, b, x_init, epsilon, maxiter, preconditioner=precond)
+        converged = epsilon is None or residual_norm(A, x, b) <= epsilon
+        if method not in ('cholesky', 'lu') and not converged:
+            # metoda iteracyjna nie osiągnęła zadanej dokładności (albo zwróciła NaN)
+            method += '+lu'
+            x = _direct_solve(A, b)
+            resid = list(resid) + [residual_norm(A, x, b)]
+            converged = resid[-1] <= epsilon
+        info = {'method': method, 'setup_time': setup_time,
+                'solve_time': time.perf_counter() - start, 'resid': resid, 'converged': converged}
+        auto_solve_log.append(info)
+        return x, info
+    except (ValueError, TypeError, np.linalg.LinAlgError):
+        return None
@@ -5,6 +5,8 @@ import main
 import pickle
 import math
 import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import spsolve
 
 from typing import Union, List, Tuple, Optional
 
@@ -62,3 +64,163 @@ def test_solve_jacobi(A: np.ndarray, b: np.ndarray, x_init: np.ndarray,
         assert test is None, 'Spodziewany wynik: {0}, aktualny {1}. Błedy wejścia.'.format(result, test)
     else:    
         assert test[0] == pytest.approx(result[0]), 'Spodziewany wynik: {0}, aktualny {1}.'.format(result, test)
+
+
+def _sparse_spd(m: int) -> sparse.csr_matrix:
+    return sparse.diags([-np.ones(m - 1), 4 * np.ones(m), -np.ones(m - 1)], [-1, 0, 1], format='csr') + sparse.eye(m, k=5, format='csr') * -0.5 + sparse.eye(m, k=-5, format='csr') * -0.5
+
+
+@pytest.mark.parametrize("A", [_sparse_spd(30), sparse.random(20, 20, density=0.2, random_state=0, format='csr') + sparse.eye(20, format='csr'),
+                               np.array([[3.0, 1.0], [2.0, 1.0]])])
+@pytest.mark.parametrize("fmt", ['csr', 'csc'])
+def test_sparse_checks(A, fmt: str):
+    dense = A.toarray() if sparse.issparse(A) else A
+    A = sparse.csr_matrix(A).asformat(fmt)
+    assert main.is_diag_dominant(A) == main.is_diag_dominant(dense), 'Wynik is_diag_dominant zależy od formatu macierzy.'
+    assert main.is_symmetric(A) == main.is_symmetric(dense), 'Wynik is_symmetric zależy od formatu macierzy.'
+    assert main.cg_req(A) == main.cg_req(dense), 'Wynik cg_req zależy od formatu macierzy.'
+
+
+def test_solve_jacobi_sparse():
+    A = _sparse_spd(40)
+    b = np.arange(1.0, 41.0)
+    x, _ = main.solve_jacobi(A, b, np.zeros(40), 1e-12, 500)
+    assert x == pytest.approx(spsolve(A.tocsc(), b)), 'Rozwiązanie różni się od spsolve.'
+
+
+def _diag_dominant(m: int) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(m)
+    A = rng.random((m, m))
+    A += np.diag(A.sum(axis=1) + 1)
+    return A, rng.random(m)
+
+
+@pytest.mark.parametrize("omega", [1.0, 1.2, 'auto'])
+def test_solve_sor(omega):
+    A, b = _diag_dominant(20)
+    x, resid = main.solve_sor(A, b, np.zeros(20), 1e-10, 500, omega)
+    assert x == pytest.approx(np.linalg.solve(A, b), rel=1e-6), 'Rozwiązanie SOR różni się od np.linalg.solve.'
+
+
+def test_solve_gauss_seidel():
+    A, b = _diag_dominant(15)
+    x, resid = main.solve_gauss_seidel(A, b, np.zeros(15), 1e-10, 500)
+    assert x == pytest.approx(np.linalg.solve(A, b), rel=1e-6), 'Rozwiązanie Gaussa-Seidla różni się od np.linalg.solve.'
+
+
+@pytest.mark.parametrize("A", [_sparse_spd(30), sparse.random(40, 40, density=0.1, random_state=0, format='csr') + 5 * sparse.eye(40, format='csr')])
+def test_ilu0_pattern(A):
+    L, U = main.ilu0(A)
+    LU = (L + sparse.eye(A.shape[0])) @ U
+    rows, cols = A.nonzero()
+    assert np.asarray(LU[rows, cols]).ravel() == pytest.approx(np.asarray(A[rows, cols]).ravel()), 'LU różni się od A na pozycjach niezerowych A.'
+    assert set(zip(*L.nonzero())) | set(zip(*U.nonzero())) <= set(zip(rows, cols)), 'Czynniki ILU(0) nie mogą mieć wypełnienia.'
+
+
+@pytest.mark.parametrize("solver", ['cg', 'gmres'])
+@pytest.mark.parametrize("preconditioner", [None, 'jacobi', 'ilu0'])
+def test_krylov_vs_spsolve(solver: str, preconditioner: str):
+    A = _sparse_spd(50)
+    b = np.arange(1.0, 51.0)
+    if solver == 'cg':
+        x, resid = main.solve_cg(A, b, np.zeros(50), 1e-10, 200, preconditioner)
+    else:
+        x, resid = main.solve_gmres(A, b, np.zeros(50), 1e-10, 200, 20, preconditioner)
+    assert x == pytest.approx(spsolve(A.tocsc(), b), rel=1e-8), 'Rozwiązanie różni się od spsolve.'
+    assert resid[-1] <= 1e-10, 'Nie osiągnięto zadanej dokładności: {0}.'.format(resid[-1])
+
+
+@pytest.mark.parametrize("A", [_sparse_spd(60), _sparse_spd(60).toarray(), _diag_dominant(15)[0], np.random.default_rng(1).random((15, 15))])
+def test_auto_solve(A):
+    b = np.arange(1.0, A.shape[0] + 1)
+    x, info = main.auto_solve(A, b, epsilon=1e-10)
+    dense = A.toarray() if sparse.issparse(A) else A
+    assert x == pytest.approx(np.linalg.solve(dense, b), rel=1e-6), 'Rozwiązanie metody {0} różni się od np.linalg.solve.'.format(info['method'])
+
+
+@pytest.mark.parametrize("generator", [main.random_matrix_Ab, main.diag_dominant_matrix_A_b, main.symmetric_matrix_A_b])
+def test_local_rng(generator):
+    state = np.random.get_state()
+    A1, b1 = generator(6, np.random.default_rng(3))
+    A2, b2 = generator(6, 3)
+    assert np.array_equal(A1, A2) and np.array_equal(b1, b2), 'Wynik dla tego samego ziarna powinien być powtarzalny.'
+    assert np.array_equal(np.random.get_state()[1], state[1]), 'Globalny stan np.random nie powinien się zmieniać.'
+    rngs = main.spawn_rngs(2, 7)
+    assert not np.array_equal(generator(6, rngs[0])[0], generator(6, rngs[1])[0]), 'Generatory z spawn_rngs powinny być niezależne.'
+
+
+@pytest.mark.parametrize("shift,expected_spd", [(0.0, True), (-0.01, False), (-1.0, False)])
+def test_cg_req_sparse_laplacian(shift: float, expected_spd: bool):
+    m = 200
+    A = sparse.diags([-np.ones(m - 1), (2 + shift) * np.ones(m), -np.ones(m - 1)], [-1, 0, 1], format='csr')
+    assert main.cg_req(A) == expected_spd, 'Spodziewany wynik: {0}, aktualny {1}.'.format(expected_spd, main.cg_req(A))
+
+
+@pytest.mark.parametrize("m", [300, 3000])
+def test_cg_req_nearly_indefinite(m: int):
+    lambda_min = 2 - 2 * np.cos(np.pi / (m + 1))
+    A = sparse.diags([-np.ones(m - 1), (2 - 1.5 * lambda_min) * np.ones(m), -np.ones(m - 1)], [-1, 0, 1], format='csr')
+    assert main.cg_req(A) is not True, 'Macierz nieokreślona nie może zostać uznana za dodatnio określoną.'
+    assert main.cg_req(A.toarray()) is not True, 'Macierz nieokreślona nie może zostać uznana za dodatnio określoną.'
+    assert main.choose_method(main.matrix_properties(A)) != 'cg', 'Dla nierozstrzygniętej określoności nie należy wybierać CG.'
+
+
+@pytest.mark.parametrize("A", [np.array([[0, 1], [1, 0]]), sparse.csr_matrix(np.array([[0.0, 2.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 3.0]]))])
+def test_auto_solve_zero_diagonal(A):
+    b = np.arange(1.0, A.shape[0] + 1)
+    x, info = main.auto_solve(A, b)
+    dense = A.toarray() if sparse.issparse(A) else A
+    assert x == pytest.approx(np.linalg.solve(dense, b)), 'Rozwiązanie metody {0} różni się od np.linalg.solve.'.format(info['method'])
+
+
+@pytest.mark.parametrize("m", [10, 50])
+def test_jacobi_spectral_radius(m: int):
+    A = sparse.diags([-np.ones(m - 1), 2 * np.ones(m), -np.ones(m - 1)], [-1, 0, 1], format='csr')
+    rho = main.jacobi_spectral_radius(A, 500)
+    assert rho == pytest.approx(np.cos(np.pi / (m + 1)), rel=1e-3), 'Spodziewany wynik: {0}, aktualny {1}.'.format(np.cos(np.pi / (m + 1)), rho)
+
+
+@pytest.mark.parametrize("jacobi_rho,expected_method", [(0.1, 'jacobi'), (0.5, 'jacobi'), (0.9, 'gmres'), (None, 'gmres')])
+def test_choose_method_jacobi_rho(jacobi_rho, expected_method: str):
+    props = {'size': 5000, 'sparse': True, 'spd': False, 'diag_dominant': True, 'jacobi_rho': jacobi_rho}
+    assert main.choose_method(props) == expected_method, 'Spodziewany wynik: {0}, aktualny {1}.'.format(expected_method, main.choose_method(props))
+
+
+def test_solve_sor_default_omega():
+    A, b = _diag_dominant(30)
+    x_sor, resid_sor = main.solve_sor(A, b, np.zeros(30), 1e-10, 500)
+    x_gs, resid_gs = main.solve_gauss_seidel(A, b, np.zeros(30), 1e-10, 500)
+    assert x_sor == pytest.approx(x_gs) and len(resid_sor) == len(resid_gs), 'Domyślne omega=1 powinno dawać metodę Gaussa-Seidla.'
+    assert main.choose_sor_omega(A, b, np.zeros(30)) == 1.0, 'Dla macierzy silnie diagonalnie zdominowanej omega=1 jest najlepsze.'
+
+
+def test_cg_req_dense_no_factorization(monkeypatch):
+    M = np.random.default_rng(0).random((20, 20))
+    A = M @ M.T + 1e-3 * np.eye(20)
+    assert main.cg_req(A) is True, 'Dla małej macierzy gęstej rozstrzyga rozkład Cholesky\'ego.'
+    monkeypatch.setattr(main, '_DIRECT_SIZE', 10)
+    monkeypatch.setattr(np.linalg, 'cholesky', None)
+    assert main.cg_req(A) is None, 'Dla dużej macierzy gęstej cg_req nie powinna liczyć rozkładu O(m^3).'
+    assert main.cg_req(A - 10 * np.eye(20)) is False, 'Niedodatnia przekątna dowodzi, że macierz nie jest dodatnio określona.'
+
+
+@pytest.mark.parametrize("kind", ['dense_spd', 'shifted_laplacian', 'sparse_spd'])
+def test_auto_solve_checks_residual(monkeypatch, kind: str):
+    monkeypatch.setattr(main, '_DIRECT_SIZE', 10)
+    m = 60
+    if kind == 'dense_spd':
+        M = np.random.default_rng(0).random((m, m))
+        A = M @ M.T + 1e-3 * np.eye(m)
+    elif kind == 'shifted_laplacian':
+        lambda_min = 2 - 2 * np.cos(np.pi / (m + 1))
+        A = sparse.diags([-np.ones(m - 1), (2 - 1.5 * lambda_min) * np.ones(m), -np.ones(m - 1)], [-1, 0, 1], format='csr')
+    else:
+        A = _sparse_spd(m)
+    b = np.ones(m)
+    x, info = main.auto_solve(A, b, epsilon=1e-6, maxiter=5)
+    dense = A.toarray() if sparse.issparse(A) else A
+    assert info['resid'][-1] == pytest.approx(np.linalg.norm(b - dense @ x)), 'Ostatnia norma residuum powinna dotyczyć zwracanego rozwiązania.'
+    assert info['converged'] and info['resid'][-1] <= 1e-6, 'Metoda {0} zwróciła rozwiązanie o residuum {1}.'.format(info['method'], info['resid'][-1])
+    assert x == pytest.approx(np.linalg.solve(dense, b), rel=1e-6), 'Rozwiązanie różni się od np.linalg.solve.'
+    if kind != 'sparse_spd':
+        assert info['method'].endswith('+lu'), 'Po nieudanej metodzie iteracyjnej spodziewane rozwiązanie bezpośrednie, metoda {0}.'.format(info['method'])
@@ -0,0 +1,166 @@
+import numpy as np
+from functools import lru_cache
+from typing import Callable, Tuple
+
+'''
+Kwadratury numeryczne: każda metoda wywołuje func raz, na całej tablicy punktów,
+więc func musi przyjmować np.ndarray i zwracać tablicę tego samego kształtu albo skalar (funkcja stała).
+'''
+
+# liczba zapamiętanych siatek i zestawów węzłów Gaussa-Legendre'a
+_CACHE_SIZE = 64
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def grid(a: float, b: float, n: int) -> np.ndarray:
+    """Funkcja zwracająca siatkę n+1 równoodległych punktów przedziału [a, b]; wynik jest
+    zapamiętywany i tylko do odczytu, więc kolejne wywołania z tymi samymi parametrami go nie liczą
+    Parameters:
+    a(float): początek przedziału
+    b(float): koniec przedziału
+    n(int): liczba podprzedziałów
+    Results:
+    np.ndarray: wektor (n+1,) punktów a, a + dx, ..., b
+    """
+    x = np.linspace(a, b, n + 1)
+    x.flags.writeable = False
+    return x
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def gauss_legendre_nodes(n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Funkcja zwracająca węzły i wagi n-punktowej kwadratury Gaussa-Legendre'a na [-1, 1]
+    (np.polynomial.legendre.leggauss), zapamiętywane dla każdego rzędu
+    Parameters:
+    n(int): liczba węzłów
+    Results:
+    (np.ndarray, np.ndarray): węzły (n,) i wagi (n,), tylko do odczytu
+    """
+    x, w = np.polynomial.legendre.leggauss(n)
+    x.flags.writeable = False
+    w.flags.writeable = False
+    return x, w
+
+
+def _evaluate(func: Callable, x: np.ndarray) -> np.ndarray:
+    """Wartości func w punktach x; wynik skalarny (np. funkcja stała) rozszerzany jest do kształtu x,
+    a wynik o innym kształcie powoduje ValueError"""
+    return np.broadcast_to(func(x), x.shape)
+
+
+def _check(a: float, b: float, n: int):
+    if not isinstance(n, (int, np.integer)) or n < 1 or not np.isfinite(a) or not np.isfinite(b) or a >= b:
+        raise ValueError
+
+
+def rect(func: Callable, a: float, b: float, n: int):
+    """Funkcja obliczająca całkę metodą prostokątów (wartość w lewym końcu każdego podprzedziału)
+    Parameters:
+    func(Callable): funkcja podcałkowa, przyjmująca wektor argumentów
+    a(float): początek przedziału
+    b(float): koniec przedziału
+    n(int): liczba podprzedziałów
+    Results:
+    float: przybliżona wartość całki
+           Jeżeli dane wejściowe niepoprawne funkcja zwraca None
+    """
+    try:
+        _check(a, b, n)
+        x = grid(a, b, n)
+        return (b - a) / n * np.sum(_evaluate(func, x[:-1]))
+    except (ValueError, TypeError):
+        return None
+
+
+def trapezoid(func: Callable, a: float, b: float, n: int):
+    """Funkcja obliczająca całkę złożoną metodą trapezów
+    Parameters:
+    func(Callable): funkcja podcałkowa, przyjmująca wektor argumentów
+    a(float): początek przedziału
+    b(float): koniec przedziału
+    n(int): liczba podprzedziałów
+    Results:
+    float: przybliżona wartość całki
+           Jeżeli dane wejściowe niepoprawne funkcja zwraca None
+    """
+    try:
+        _check(a, b, n)
+        y = _evaluate(func, grid(a, b, n))
+        return (b - a) / n * (np.sum(y[1:-1]) + (y[0] + y[-1]) / 2)
+    except (ValueError, TypeError):
+        return None
+
+
+def simpson(func: Callable, a: float, b: float, n: int):
+    """Funkcja obliczająca całkę złożoną metodą Simpsona
+    Parameters:
+    func(Callable): funkcja podcałkowa, przyjmująca wektor argumentów
+    a(float): początek przedziału
+    b(float): koniec przedziału
+    n(int): liczba podprzedziałów, parzysta
+    Results:
+    float: przybliżona wartość całki
+           Jeżeli dane wejściowe niepoprawne funkcja zwraca None
+    """
+    try:
+        _check(a, b, n)
+        if n % 2:
+            raise ValueError
+        y = _evaluate(func, grid(a, b, n))
+        return (b - a) / n / 3 * (y[0] + y[-1] + 4 * np.sum(y[1:-1:2]) + 2 * np.sum(y[2:-1:2]))
+    except (ValueError, TypeError):
+        return None
+
+
+def romberg(func: Callable, a: float, b: float, levels: int = 10):
+    """Funkcja obliczająca całkę metodą Romberga: func liczona jest raz na siatce 2^levels podprzedziałów,
+    wzory trapezów dla grubszych siatek biorą co 2^j-ty punkt, a wyniki poprawiane są ekstrapolacją Richardsona
+    Parameters:
+    func(Callable): funkcja podcałkowa, przyjmująca wektor argumentów
+    a(float): początek przedziału
+    b(float): koniec przedziału
+    levels(int): liczba podziałów przedziału na pół
+    Results:
+    float: przybliżona wartość całki
+           Jeżeli dane wejściowe niepoprawne funkcja zwraca None
+    """
+    try:
+        _check(a, b, 1)
+        if not isinstance(levels, (int, np.integer)) or levels < 0:
+            raise ValueError
+        y = _evaluate(func, grid(a, b, 2 ** levels))
+        r = np.empty(levels + 1)
+        for k in range(levels + 1):
+            yk = y[::2 ** (levels - k)]
+            r[k] = (b - a) / 2 ** k * (np.sum(yk[1:-1]) + (yk[0] + yk[-1]) / 2)
+        for j in range(1, levels + 1):
+            r[j:] = r[j:] + (r[j:] - r[j - 1:-1]) / (4 ** j - 1)
+        return r[-1]
+    except (ValueError, TypeError):
+        return None
+
+
+def gauss_legendre(func: Callable, a: float, b: float, n: int = 5, panels: int = 1):
+    """Funkcja obliczająca całkę złożoną kwadraturą Gaussa-Legendre'a: przedział dzielony jest na panels
+    części, na każdej n węzłów (gauss_legendre_nodes); func liczona jest raz dla wszystkich węzłów
+    Parameters:
+    func(Callable): funkcja podcałkowa, przyjmująca wektor argumentów
+    a(float): początek przedziału
+    b(float): koniec przedziału
+    n(int): liczba węzłów na część
+    panels(int): liczba części przedziału
+    Results:
+    float: przybliżona wartość całki
+           Jeżeli dane wejściowe niepoprawne funkcja zwraca None
+    """
+    try:
+        _check(a, b, panels)
+        if not isinstance(n, (int, np.integer)) or n < 1:
+            raise ValueError
+        x, w = gauss_legendre_nodes(n)
+        edges = grid(a, b, panels)
+        half = (b - a) / panels / 2
+        nodes = (edges[:-1] + half)[:, np.newaxis] + half * x
+        return half * np.sum(_evaluate(func, nodes) @ w)
+    except (ValueError, TypeError):
+        return None
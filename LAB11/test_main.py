@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import integration
+import numpy as np
+
+
+@pytest.mark.parametrize("func,a,b,result", [(np.sin, 0, np.pi, 2.0), (np.exp, -1, 2, np.exp(2) - np.exp(-1)), (lambda x: x ** 3, 0, 1, 0.25)])
+@pytest.mark.parametrize("method,kwargs,tol", [(integration.rect, {'n': 4096}, 1e-2), (integration.trapezoid, {'n': 1024}, 1e-5),
+                                               (integration.simpson, {'n': 128}, 1e-7), (integration.romberg, {'levels': 8}, 1e-12),
+                                               (integration.gauss_legendre, {'n': 8, 'panels': 2}, 1e-12)])
+def test_quadrature(func, a: float, b: float, result: float, method, kwargs: dict, tol: float):
+    value = method(func, a, b, **kwargs)
+    assert value == pytest.approx(result, abs=tol), 'Spodziewany wynik: {0}, aktualny {1}.'.format(result, value)
+
+
+@pytest.mark.parametrize("method,a,b,kwargs", [(integration.rect, 0, 1, {'n': 0}), (integration.trapezoid, 1, 0, {'n': 4}),
+                                               (integration.simpson, 0, 1, {'n': 5}), (integration.romberg, 0, np.inf, {'levels': 3}),
+                                               (integration.gauss_legendre, 0, 1, {'n': 0}), (integration.trapezoid, 0, 1, {'n': 2.5})])
+def test_quadrature_invalid(method, a: float, b: float, kwargs: dict):
+    assert method(np.sin, a, b, **kwargs) is None, 'Dla niepoprawnych danych funkcja powinna zwracać None.'
+
+
+def test_grid_cached():
+    x = integration.grid(0.0, 1.0, 10)
+    assert x is integration.grid(0.0, 1.0, 10), 'Siatka powinna być zapamiętana.'
+    assert not x.flags.writeable, 'Zapamiętana siatka powinna być tylko do odczytu.'
+
+
+@pytest.mark.parametrize("method,kwargs", [(integration.rect, {'n': 7}), (integration.trapezoid, {'n': 7}), (integration.simpson, {'n': 8}),
+                                           (integration.romberg, {'levels': 4}), (integration.gauss_legendre, {'n': 3, 'panels': 5})])
+def test_quadrature_constant(method, kwargs: dict):
+    value = method(lambda x: 3.0, -1, 1, **kwargs)
+    assert value == pytest.approx(6.0), 'Spodziewany wynik: {0}, aktualny {1}.'.format(6.0, value)
@@ -0,0 +1,55 @@
+import time
+import numpy as np
+
+import main
+
+
+def solve_euler_legacy(fun, t_span: np.ndarray, y0: np.ndarray) -> np.ndarray:
+    """Poprzednia wersja solve_euler (nadpisuje y0) - punkt odniesienia dla pomiarów."""
+    y = y0
+    for i in range(0, y.shape[0] - 1):
+        y[i + 1, :] = y[i, :] + fun(y[i, :], t_span[i]) * (t_span[i + 1] - t_span[i])
+    return y
+
+
+def measure(fun, *args, repeat: int = 3, **kwargs) -> float:
+    """Zwraca najkrótszy z repeat czasów wykonania fun(*args, **kwargs) w sekundach."""
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fun(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == '__main__':
+    A = np.array([[-667, 333], [666, -334]], dtype=np.float64)
+    fun = lambda x, t: A @ x
+    fun_inplace = lambda x, t, out: np.matmul(A, x, out=out)
+
+    print('mały układ (n = 2): czas kroku zależy głównie od narzutu pętli Pythona')
+    for steps in [10 ** 4, 10 ** 5, 10 ** 6]:
+        t = np.linspace(0, 1, steps)
+        y0 = np.zeros((steps, 2))
+        y0[0] = [0, 3]
+        out = np.empty_like(y0)
+        t_legacy = measure(lambda: solve_euler_legacy(fun, t, y0.copy()))
+        t_new = measure(main.solve_euler, fun, t, y0, out=out)
+        t_inplace = measure(main.solve_euler, fun_inplace, t, y0, out=out, inplace=True)
+        print(f'kroki = {steps:8d} | poprzednio: {t_legacy / steps * 1e6:8.3f} us/krok | '
+              f'out=: {t_new / steps * 1e6:8.3f} us/krok | out= + inplace: {t_inplace / steps * 1e6:8.3f} us/krok')
+
+    print('duży układ: inplace unika tablic tymczasowych o rozmiarze stanu')
+    decay = lambda x, t: -0.5 * x
+    decay_inplace = lambda x, t, out: np.multiply(x, -0.5, out=out)
+    for n in [10 ** 4, 10 ** 5, 10 ** 6]:
+        steps = 100
+        t = np.linspace(0, 1, steps)
+        y0 = np.zeros((steps, n))
+        y0[0] = 1
+        out = np.empty_like(y0)
+        t_legacy = measure(lambda: solve_euler_legacy(decay, t, y0.copy()))
+        t_new = measure(main.solve_euler, decay, t, y0, out=out)
+        t_inplace = measure(main.solve_euler, decay_inplace, t, y0, out=out, inplace=True)
+        print(f'n = {n:8d} | poprzednio: {t_legacy / steps * 1e6:10.1f} us/krok | '
+              f'out=: {t_new / steps * 1e6:10.1f} us/krok | out= + inplace: {t_inplace / steps * 1e6:10.1f} us/krok')
@@ -1,22 +1,375 @@
+import os
 import numpy as np
+from scipy import linalg
+from concurrent.futures import ProcessPoolExecutor
 from typing import Union, Callable
 
 
-def solve_euler(fun: Callable, t_span: np.array, y0: np.array):
+def solve_euler(fun: Callable, t_span: np.array, y0: np.array, out: np.array = None, inplace: bool = False):
     ''' 
     Funkcja umożliwiająca rozwiązanie układu równań różniczkowych z wykorzystaniem metody Eulera w przód.
     
     Parameters:
-    fun: Prawa strona równania. Podana funkcja musi mieć postać fun(t, y). 
-    Tutaj t jest skalarem i istnieją dwie opcje dla ndarray y: Może mieć kształt (n,); wtedy fun musi zwrócić array_like z kształtem (n,). 
-    Alternatywnie może mieć kształt (n, k); wtedy fun musi zwrócić tablicę typu array_like z kształtem (n, k), tj. każda kolumna odpowiada jednej kolumnie w y. 
-    t_span: wektor czasu dla którego ma zostać rozwiązane równanie
-    y0: warunke początkowy równanai o wymiarze (n,)
+    fun: Prawa strona równania. Podana funkcja musi mieć postać fun(y, t) (albo fun(y, t, out) dla inplace=True). 
+    Tutaj t jest skalarem, a y ma kształt (n,); fun musi zwrócić array_like z kształtem (n,).
+    Wiele warunków początkowych naraz (stan (n, k)) obsługuje solve_ensemble.
+    t_span: wektor czasu (m,) dla którego ma zostać rozwiązane równanie
+    y0: warunke początkowy równanai o wymiarze (n,); dla zgodności wstecz również tablica (m, n)
+        z warunkiem początkowym w pierwszym wierszu - nie jest ona modyfikowana;
+        inna tablica dwuwymiarowa jest niejednoznaczna i powoduje ValueError
+    out: tablica (m, n) na wynik; domyślnie tworzona nowa, y0 nigdy nie jest nadpisywane
+    inplace: czy fun zapisuje pochodną do podanej tablicy: fun(y, t, out), gdzie out to następny wiersz
+             wyniku - pętla nie tworzy wtedy tablic tymczasowych o rozmiarze stanu (powstają tylko
+             widoki kolejnych wierszy out); zysk jest widoczny dla dużych n, dla małych n czas kroku
+             zależy głównie od narzutu pętli Pythona (benchmark.py)
     Results:
-    (np.array): macierz o wymiarze (n,m) zawierająca w wkolumnach kolejne rozwiązania fun w czasie t_span.  
+    (np.array): macierz o wymiarze (m,n) zawierająca w wierszach kolejne rozwiązania fun w czasie t_span.  
 
     '''
-    y = y0
-    for i in range(0, y.shape[0] - 1):
-        y[i + 1, :] = y[i, :] + fun(y[i, :], t_span[i]) * (t_span[i + 1] - t_span[i])
-    return y
+    y_init = _initial_state(y0, len(t_span))
+    if out is None:
+        out = np.empty((len(t_span),) + y_init.shape)
+    out[0] = y_init
+    # kroki i chwile jako liczby Pythona - indeksowanie tablic numpy w pętli jest wolniejsze
+    dt = np.diff(t_span).tolist()
+    times = np.asarray(t_span).tolist()
+    steps = zip(dt, times, out[:-1], out[1:])
+    if inplace:
+        # pochodna zapisywana jest od razu w następnym wierszu out, bez osobnego bufora
+        for h, t, y, y_next in steps:
+            fun(y, t, y_next)
+            y_next *= h
+            y_next += y
+    else:
+        for h, t, y, y_next in steps:
+            np.multiply(fun(y, t), h, out=y_next)
+            y_next += y
+    return out
+
+
+# współczynniki metody Dormanda-Prince'a (RK45): węzły c, macierz a, wagi rzędu 5 (b) i różnica wag b - b* (e)
+_DP_C = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1])
+_DP_A = [np.array([]),
+         np.array([1 / 5]),
+         np.array([3 / 40, 9 / 40]),
+         np.array([44 / 45, -56 / 15, 32 / 9]),
+         np.array([19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729]),
+         np.array([9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656]),
+         np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84])]
+_DP_B = _DP_A[6]
+_DP_E = np.array([71 / 57600, 0, -71 / 16695, 71 / 1920, -17253 / 339200, 22 / 525, -1 / 40])
+# najkrótszy krok solve_rk45 i solve_backward_euler w odstępach między sąsiednimi liczbami zmiennoprzecinkowymi w t
+_MIN_STEP = 10
+
+
+def _initial_state(y0: np.array, m: int) -> np.array:
+    '''Warunek początkowy (n,): y0 albo pierwszy wiersz tablicy (m, n) przygotowanej jak dla solve_euler;
+    tablica dwuwymiarowa o innej liczbie wierszy niż m powoduje ValueError.'''
+    y0 = np.asarray(y0, dtype=float)
+    if y0.ndim == 2 and y0.shape[0] == m:
+        return y0[0].copy()
+    if y0.ndim != 1:
+        raise ValueError(f'Warunek początkowy musi mieć kształt (n,) albo ({m}, n), a ma {y0.shape}')
+    return y0.copy()
+
+
+def _new_stats() -> dict:
+    '''Słownik statystyk solverów: liczba obliczeń fun i jakobianu, rozkładów LU, kroków zaakceptowanych i odrzuconych.'''
+    return {'nfev': 0, 'njev': 0, 'nlu': 0, 'accepted': 0, 'rejected': 0}
+
+
+def solve_rk4(fun: Callable, t_span: np.array, y0: np.array):
+    '''
+    Funkcja rozwiązująca układ równań różniczkowych klasyczną metodą Rungego-Kutty rzędu 4 ze stałym krokiem.
+
+    Parameters:
+    fun: Prawa strona równania w postaci fun(y, t), jak w solve_euler.
+    t_span: wektor czasu (m,), dla którego ma zostać rozwiązane równanie
+    y0: warunek początkowy (n,) albo tablica (m, n) z warunkiem początkowym w pierwszym wierszu
+    Results:
+    (np.array, dict): macierz (m, n) z rozwiązaniami w chwilach t_span i słownik statystyk
+                      (nfev, njev, nlu, accepted, rejected)
+    '''
+    t_span = np.asarray(t_span, dtype=float)
+    y0 = _initial_state(y0, len(t_span))
+    y = np.empty((len(t_span),) + y0.shape)
+    y[0] = y0
+    stats = _new_stats()
+    for i, h in enumerate(np.diff(t_span)):
+        t, yi = t_span[i], y[i]
+        k1 = fun(yi, t)
+        k2 = fun(yi + h / 2 * k1, t + h / 2)
+        k3 = fun(yi + h / 2 * k2, t + h / 2)
+        k4 = fun(yi + h * k3, t + h)
+        y[i + 1] = yi + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+    stats['nfev'] = 4 * (len(t_span) - 1)
+    stats['accepted'] = len(t_span) - 1
+    return y, stats
+
+
+def solve_rk45(fun: Callable, t_span: np.array, y0: np.array, rtol: float = 1e-6, atol: float = 1e-9,
+               first_step: float = None, max_step: float = np.inf):
+    '''
+    Funkcja rozwiązująca układ równań różniczkowych metodą Dormanda-Prince'a (RK45) ze zmiennym krokiem.
+    Długość kroku dobierana jest na podstawie oszacowania błędu lokalnego (różnica rozwiązań rzędu 5 i 4),
+    a wartości w chwilach t_span wyznaczane są interpolacją Hermite'a między kolejnymi krokami,
+    więc gęsta siatka t_span nie zmniejsza kroku całkowania.
+
+    Parameters:
+    fun: Prawa strona równania w postaci fun(y, t), jak w solve_euler.
+    t_span: rosnący wektor czasu (m,), w którego chwilach zwracane jest rozwiązanie
+    y0: warunek początkowy (n,) albo tablica (m, n) z warunkiem początkowym w pierwszym wierszu
+    rtol, atol: względna i bezwzględna tolerancja błędu lokalnego
+    first_step: długość pierwszego kroku, domyślnie szacowana z fun(y0, t0)
+    max_step: maksymalna długość kroku
+    Results:
+    (np.array, dict): macierz (m, n) z rozwiązaniami w chwilach t_span i słownik statystyk
+                      (nfev, njev, nlu, accepted, rejected)
+    Nierosnący t_span albo niedodatnie first_step, max_step powodują ValueError; RuntimeError, gdy
+    po odrzuceniu kroku jego długość spada poniżej _MIN_STEP odstępów liczb zmiennoprzecinkowych w t
+    (np. rozwiązanie przestaje być skończone).
+    '''
+    t_span = np.asarray(t_span, dtype=float)
+    if t_span.ndim != 1 or np.any(np.diff(t_span) <= 0):
+        raise ValueError('t_span musi być ściśle rosnącym wektorem czasu')
+    if (first_step is not None and not first_step > 0) or not max_step > 0:
+        raise ValueError('first_step i max_step muszą być dodatnie')
+    yi = _initial_state(y0, len(t_span))
+    y = np.empty((len(t_span),) + yi.shape)
+    y[0] = yi
+    stats = _new_stats()
+    t, t_end = t_span[0], t_span[-1]
+    f = np.asarray(fun(yi, t), dtype=float)
+    stats['nfev'] += 1
+    if first_step is None:
+        scale = atol + rtol * np.abs(yi)
+        d0, d1 = np.sqrt(np.mean((yi / scale) ** 2)), np.sqrt(np.mean((f / scale) ** 2))
+        first_step = 0.01 * d0 / d1 if d0 > 1e-5 and d1 > 1e-5 else 1e-6
+    h = min(first_step, max_step, t_end - t)
+    # t rośnie od t_span[0] do t_end, więc odstęp liczb w t_end (albo t_span[0]) ogranicza odstępy w każdym t
+    h_min = _MIN_STEP * np.spacing(max(abs(t_span[0]), abs(t_end)))
+    k = np.empty((7,) + yi.shape)
+    out = 1
+    while out < len(t_span):
+        # krok kończący całkowanie trafia dokładnie w t_end, zamiast zostawiać resztę krótszą od h_min
+        last = t_end - t - h < h_min
+        if last:
+            h = t_end - t
+        k[0] = f
+        for s in range(1, 7):
+            k[s] = fun(yi + h * np.tensordot(_DP_A[s], k[:s], axes=1), t + _DP_C[s] * h)
+        stats['nfev'] += 6
+        y_new = yi + h * np.tensordot(_DP_B, k[:6], axes=1)
+        scale = atol + rtol * np.maximum(np.abs(yi), np.abs(y_new))
+        err = np.sqrt(np.mean((h * np.tensordot(_DP_E, k, axes=1) / scale) ** 2))
+        # nieskończony albo nieokreślony (NaN) błąd również odrzuca krok
+        if not err <= 1:
+            stats['rejected'] += 1
+            h *= max(0.2, 0.9 * err ** -0.2) if np.isfinite(err) else 0.2
+            if h < h_min:
+                raise RuntimeError(f'Długość kroku spadła poniżej {h_min:.3g} w t = {t:.6g}')
+            continue
+        stats['accepted'] += 1
+        t_new, f_new = (t_end if last else t + h), k[6].copy()
+        # gęste wyjście: wielomian Hermite'a trzeciego stopnia na przedziale [t, t + h]
+        stop = np.searchsorted(t_span, t_new, side='right') if not last else len(t_span)
+        if stop > out:
+            theta = ((t_span[out:stop] - t) / h).reshape((-1,) + (1,) * yi.ndim)
+            y[out:stop] = ((2 * theta ** 3 - 3 * theta ** 2 + 1) * yi + (theta ** 3 - 2 * theta ** 2 + theta) * h * f
+                           + (3 * theta ** 2 - 2 * theta ** 3) * y_new + (theta ** 3 - theta ** 2) * h * f_new)
+            out = stop
+        t, yi, f = t_new, y_new, f_new
+        h *= min(10.0, 0.9 * err ** -0.2) if err > 0 else 10.0
+        h = min(h, max_step)
+    return y, stats
+
+
+def solve_backward_euler(fun: Callable, t_span: np.array, y0: np.array, jac: Callable = None,
+                         tol: float = 1e-10, max_newton: int = 10):
+    '''
+    Funkcja rozwiązująca układ równań różniczkowych niejawną metodą Eulera wstecz (BDF rzędu 1),
+    odpowiednią dla układów sztywnych. W każdym kroku równanie y_{i+1} = y_i + h fun(y_{i+1}, t_{i+1})
+    rozwiązywane jest uproszczoną metodą Newtona: macierz I - h J rozkładana jest (LU) raz na krok.
+    Gdy metoda Newtona nie osiągnie tolerancji, krok jest odrzucany, a przedział [t_i, t_{i+1}]
+    przechodzony krokami o połowę krótszymi (po udanym kroku krok znów rośnie dwukrotnie).
+
+    Parameters:
+    fun: Prawa strona równania w postaci fun(y, t), jak w solve_euler.
+    t_span: wektor czasu (m,), dla którego ma zostać rozwiązane równanie
+    y0: warunek początkowy (n,) albo tablica (m, n) z warunkiem początkowym w pierwszym wierszu
+    jac: jakobian prawej strony jac(y, t) -> (n, n); domyślnie przybliżany ilorazami różnicowymi
+    tol: tolerancja normy poprawki Newtona
+    max_newton: maksymalna liczba iteracji Newtona w kroku
+    Results:
+    (np.array, dict): macierz (m, n) z rozwiązaniami w chwilach t_span i słownik statystyk
+                      (nfev, njev, nlu, accepted, rejected); rejected liczy kroki, w których
+                      metoda Newtona nie osiągnęła tolerancji
+    RuntimeError, gdy krok po podziałach jest krótszy niż _MIN_STEP odstępów liczb zmiennoprzecinkowych w t.
+    '''
+    t_span = np.asarray(t_span, dtype=float)
+    yi = _initial_state(y0, len(t_span))
+    y = np.empty((len(t_span), yi.size))
+    y[0] = yi
+    stats = _new_stats()
+    for i in range(len(t_span) - 1):
+        t, t_end = t_span[i], t_span[i + 1]
+        h_min = _MIN_STEP * np.spacing(max(abs(t), abs(t_end)))
+        h = t_end - t
+        while t != t_end:
+            # ostatni krok przedziału trafia dokładnie w t_{i+1}
+            last = abs(t_end - t) <= abs(h)
+            t_new = t_end if last else t + h
+            y_new = _backward_euler_step(fun, jac, yi, t, t_new - t, tol, max_newton, stats)
+            if y_new is None:
+                stats['rejected'] += 1
+                h /= 2
+                if abs(h) < h_min:
+                    raise RuntimeError(f'Metoda Newtona nie jest zbieżna nawet dla kroku {h:.3g} w t = {t:.6g}')
+                continue
+            stats['accepted'] += 1
+            t, yi = t_new, y_new
+            h *= 2
+        y[i + 1] = yi
+    return y, stats
+
+
+def _backward_euler_step(fun: Callable, jac: Callable, y: np.array, t: float, h: float, tol: float,
+                         max_newton: int, stats: dict) -> np.array:
+    '''Jeden krok metody Eulera wstecz z y w chwili t do t + h (statystyki dopisywane do stats);
+    zwraca None, jeśli metoda Newtona nie osiągnęła tolerancji w max_newton iteracjach.'''
+    n = y.size
+    t_new = t + h
+    y_new = y + h * np.asarray(fun(y, t), dtype=float)
+    stats['nfev'] += 1
+    if jac is None:
+        f0 = np.asarray(fun(y_new, t_new), dtype=float)
+        eps = np.sqrt(np.finfo(float).eps) * np.maximum(np.abs(y_new), 1)
+        # ilorazy różnicowe na jednej kopii stanu zaburzanej kolejno w miejscu
+        J = np.empty((n, n))
+        y_pert = y_new.copy()
+        for j in range(n):
+            y_pert[j] += eps[j]
+            J[:, j] = (np.asarray(fun(y_pert, t_new), dtype=float) - f0) / (y_pert[j] - y_new[j])
+            y_pert[j] = y_new[j]
+        stats['nfev'] += n + 1
+    else:
+        J = np.asarray(jac(y_new, t_new), dtype=float)
+    stats['njev'] += 1
+    lu = linalg.lu_factor(np.eye(n) - h * J)
+    stats['nlu'] += 1
+    with np.errstate(over='ignore', invalid='ignore'):
+        for _ in range(max_newton):
+            residual = y_new - y - h * np.asarray(fun(y_new, t_new), dtype=float)
+            stats['nfev'] += 1
+            dy = linalg.lu_solve(lu, residual, check_finite=False)
+            y_new = y_new - dy
+            if np.linalg.norm(dy) <= tol * (1 + np.linalg.norm(y_new)):
+                return y_new
+    return None
+
+
+def solve_ensemble(fun: Callable, t_span: np.array, y0: np.array, method: str = 'rk4',
+                   final_only: bool = False, workers: int = None):
+    '''
+    Funkcja rozwiązująca układ równań różniczkowych jednocześnie dla k warunków początkowych (zespół trajektorii).
+    W każdym kroku fun wywoływana jest raz dla całego zespołu: otrzymuje stan o kształcie (n, k) i musi zwrócić
+    tablicę (n, k), tj. każda kolumna odpowiada jednej trajektorii (jak w opisie solve_euler).
+
+    Parameters:
+    fun: Prawa strona równania w postaci fun(y, t), y o kształcie (n, k).
+    t_span: wektor czasu (m,), dla którego ma zostać rozwiązane równanie
+    y0: warunki początkowe (k, n) - jeden wiersz na trajektorię
+    method: 'euler' - metoda Eulera w przód, 'rk4' - klasyczna metoda Rungego-Kutty rzędu 4
+    final_only: czy zwrócić tylko stan końcowy zamiast całych trajektorii
+    workers: liczba procesów; zespół dzielony jest na części liczone w ProcessPoolExecutor
+             (fun musi dać się zserializować pickle, np. funkcja zdefiniowana w module), None - jeden proces
+    Results:
+    (np.array): macierz (m, k, n) ze stanami zespołu w chwilach t_span albo (k, n) dla final_only
+    '''
+    if method not in ('euler', 'rk4'):
+        raise ValueError(f'Nieznana metoda: {method}')
+    t_span = np.asarray(t_span, dtype=float)
+    y0 = np.atleast_2d(np.asarray(y0, dtype=float))
+    if workers is None or workers <= 1 or y0.shape[0] < 2:
+        return _ensemble_chunk(fun, t_span, y0, method, final_only)
+    chunks = np.array_split(y0, min(workers, y0.shape[0]))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_ensemble_chunk, [fun] * len(chunks), [t_span] * len(chunks), chunks,
+                                [method] * len(chunks), [final_only] * len(chunks)))
+    return np.concatenate(results, axis=0 if final_only else 1)
+
+
+def _ensemble_chunk(fun: Callable, t_span: np.array, y0: np.array, method: str, final_only: bool) -> np.array:
+    '''Całkowanie części zespołu (k, n) w jednym procesie; stan przechowywany jest jako (n, k).'''
+    y = np.ascontiguousarray(y0.T)
+    trajectory = None if final_only else np.empty((len(t_span),) + y0.shape)
+    if trajectory is not None:
+        trajectory[0] = y0
+    for i, h in enumerate(np.diff(t_span)):
+        y = _explicit_step(fun, y, t_span[i], h, method)
+        if trajectory is not None:
+            trajectory[i + 1] = y.T
+    return y.T.copy() if final_only else trajectory
+
+
+def _explicit_step(fun: Callable, y: np.array, t: float, h: float, method: str) -> np.array:
+    '''Jeden krok metody jawnej ('euler' albo 'rk4') długości h z chwili t.'''
+    if method == 'euler':
+        return y + h * fun(y, t)
+    k1 = fun(y, t)
+    k2 = fun(y + h / 2 * k1, t + h / 2)
+    k3 = fun(y + h / 2 * k2, t + h / 2)
+    k4 = fun(y + h * k3, t + h)
+    return y + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+
+def stream_solve(fun: Callable, t_span: tuple, y0: np.array, n_steps: int, method: str = 'rk4', every: int = 1,
+                 checkpoint: str = None, checkpoint_every: int = 10000, resume: bool = False):
+    '''
+    Generator rozwiązujący układ równań różniczkowych ze stałym krokiem bez przechowywania całej trajektorii.
+    Zwraca co every-ty krok pary (t, y), zawsze również stan końcowy, więc zużycie pamięci jest O(n)
+    niezależnie od liczby kroków. Stan może być zapisywany do pliku .npy mapowanego w pamięci
+    (np.lib.format.open_memmap), z którego można wznowić obliczenia.
+
+    Parameters:
+    fun: Prawa strona równania w postaci fun(y, t), jak w solve_euler.
+    t_span: krotka (t0, t_end); krok wynosi (t_end - t0) / n_steps, a chwile liczone są na bieżąco
+    y0: warunek początkowy (n,) albo tablica (n_steps + 1, n) z warunkiem początkowym w pierwszym wierszu
+    n_steps: liczba kroków
+    method: 'euler' - metoda Eulera w przód, 'rk4' - klasyczna metoda Rungego-Kutty rzędu 4
+    every: co który krok zwracana jest próbka (decymacja)
+    checkpoint: ścieżka pliku .npy z punktem kontrolnym (numer kroku i stan), None - bez zapisu
+    checkpoint_every: co ile kroków zapisywany jest punkt kontrolny
+    resume: czy wznowić obliczenia od kroku zapisanego w pliku checkpoint (jeżeli plik istnieje)
+    Results:
+    Generator[(float, np.array)]: kolejne próbki (t, y); po wznowieniu pierwszą próbką jest stan z pliku
+    '''
+    if method not in ('euler', 'rk4'):
+        raise ValueError(f'Nieznana metoda: {method}')
+    if n_steps < 1 or every < 1 or checkpoint_every < 1:
+        raise ValueError('n_steps, every i checkpoint_every muszą być dodatnie')
+    t0, t_end = t_span
+    dt = (t_end - t0) / n_steps
+    y = _initial_state(y0, n_steps + 1)
+    step = 0
+    state = None
+    if checkpoint is not None:
+        if resume and os.path.exists(checkpoint):
+            state = np.load(checkpoint, mmap_mode='r+')
+            if state.shape != (y.size + 1,):
+                raise ValueError('Punkt kontrolny nie pasuje do wymiaru układu')
+            step = int(state[0])
+            y = np.array(state[1:]).reshape(y.shape)
+        else:
+            state = np.lib.format.open_memmap(checkpoint, mode='w+', dtype=float, shape=(y.size + 1,))
+            state[0], state[1:] = step, y.ravel()
+            state.flush()
+    yield t0 + step * dt, y.copy()
+    while step < n_steps:
+        y = _explicit_step(fun, y, t0 + step * dt, dt, method)
+        step += 1
+        if state is not None and (step % checkpoint_every == 0 or step == n_steps):
+            state[0], state[1:] = step, y.ravel()
+            state.flush()
+        if step % every == 0 or step == n_steps:
+            yield t0 + step * dt, y.copy()
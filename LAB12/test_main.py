@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+import main
+import numpy as np
+
+
+def decay(y, t, out=None):
+    if out is None:
+        return -y
+    np.negative(y, out=out)
+    return out
+
+
+def oscillator(y, t):
+    return np.array([y[1], -y[0]])
+
+
+def _euler(fun, t, y0):
+    y = np.zeros((len(t), len(y0)))
+    y[0] = y0
+    return main.solve_euler(fun, t, y)
+
+
+@pytest.mark.parametrize("fun,y0,exact", [(decay, np.array([1.0, 2.0]), lambda t: np.exp(-t)[:, np.newaxis] * np.array([1.0, 2.0])),
+                                          (oscillator, np.array([0.0, 1.0]), lambda t: np.column_stack([np.sin(t), np.cos(t)]))])
+@pytest.mark.parametrize("solver,tol", [(_euler, 1e-2), (lambda *args: main.solve_rk4(*args)[0], 1e-8)])
+def test_fixed_step(fun, y0: np.ndarray, exact, solver, tol: float):
+    t = np.linspace(0, 2, 401)
+    y = solver(fun, t, y0)
+    assert y == pytest.approx(exact(t), abs=tol), 'Rozwiązanie różni się od dokładnego.'
+
+
+@pytest.mark.parametrize("rtol,atol", [(1e-6, 1e-9), (1e-9, 1e-12)])
+def test_solve_rk45(rtol: float, atol: float):
+    t = np.linspace(0, 10, 1001)
+    y, stats = main.solve_rk45(oscillator, t, np.array([0.0, 1.0]), rtol, atol)
+    assert y == pytest.approx(np.column_stack([np.sin(t), np.cos(t)]), abs=1000 * rtol), 'Rozwiązanie różni się od dokładnego.'
+    assert stats['accepted'] < len(t), 'Gęsta siatka t_span nie powinna zmniejszać kroku całkowania.'
+
+
+@pytest.mark.parametrize("t_span,kwargs", [(np.linspace(1, 0, 11), {}), (np.array([0.0, 1.0, 1.0]), {}),
+                                            (np.linspace(0, 1, 11), {'first_step': 0.0}), (np.linspace(0, 1, 11), {'max_step': -1.0})])
+def test_solve_rk45_invalid(t_span: np.ndarray, kwargs: dict):
+    with pytest.raises(ValueError):
+        main.solve_rk45(oscillator, t_span, np.array([0.0, 1.0]), **kwargs)
+
+
+@pytest.mark.parametrize("fun", [lambda y, t: y ** 2, lambda y, t: np.full_like(y, np.nan)])
+def test_solve_rk45_step_underflow(fun):
+    with np.errstate(all='ignore'), pytest.raises(RuntimeError):
+        main.solve_rk45(fun, np.linspace(0, 2, 11), np.array([1.0]))
+
+
+def test_solve_backward_euler():
+    lam = 1000.0
+    t = np.linspace(0, 1, 21)
+    y, stats = main.solve_backward_euler(lambda y, t: -lam * (y - np.cos(t)), t, np.array([0.0]), jac=lambda y, t: np.array([[-lam]]))
+    assert np.all(np.isfinite(y)) and y[-1] == pytest.approx(np.cos(1.0), abs=1e-2), 'Metoda niejawna powinna być stabilna dla układu sztywnego.'
+
+
+def test_solve_backward_euler_newton_failure():
+    fun = lambda y, t: -50 * y ** 3 + np.cos(t)
+    y, stats = main.solve_backward_euler(fun, np.linspace(0, 1, 3), np.array([10.0]), max_newton=3)
+    reference, _ = main.solve_backward_euler(fun, np.linspace(0, 1, 2001), np.array([10.0]), max_newton=50)
+    assert stats['rejected'] > 0, 'Kroki, w których metoda Newtona nie jest zbieżna, powinny być odrzucane.'
+    assert y[-1] == pytest.approx(reference[-1], abs=1e-2), 'Rozwiązanie po podziale kroku różni się od referencyjnego.'
+
+
+def test_solve_backward_euler_finite_differences():
+    A = np.array([[-100.0, 1.0], [0.5, -2.0]])
+    t = np.linspace(0, 1, 11)
+    y, _ = main.solve_backward_euler(lambda y, t: A @ y, t, np.array([1.0, 1.0]))
+    y_jac, _ = main.solve_backward_euler(lambda y, t: A @ y, t, np.array([1.0, 1.0]), jac=lambda y, t: A)
+    assert y == pytest.approx(y_jac, rel=1e-6), 'Jakobian z ilorazów różnicowych daje inne rozwiązanie niż dokładny.'
+
+
+def test_solve_backward_euler_divergence():
+    with np.errstate(all='ignore'), pytest.raises(RuntimeError):
+        main.solve_backward_euler(lambda y, t: np.full_like(y, np.nan), np.linspace(0, 1, 3), np.array([1.0]), jac=lambda y, t: np.zeros((1, 1)))
+
+
+@pytest.mark.parametrize("method", ['euler', 'rk4'])
+@pytest.mark.parametrize("workers", [None, 2])
+def test_solve_ensemble(method: str, workers):
+    t = np.linspace(0, 1, 21)
+    y0 = np.array([[0.0, 1.0], [1.0, 0.0], [2.0, -1.0]])
+    solver = _euler if method == 'euler' else lambda *args: main.solve_rk4(*args)[0]
+    expected_y = np.stack([solver(oscillator, t, v) for v in y0], axis=1)
+    y = main.solve_ensemble(oscillator, t, y0, method, workers=workers)
+    assert y == pytest.approx(expected_y), 'Rozwiązania zespołu różnią się od rozwiązań pojedynczych.'
+    assert main.solve_ensemble(oscillator, t, y0, method, final_only=True) == pytest.approx(expected_y[-1]), 'Niepoprawne stany końcowe.'
+
+
+@pytest.mark.parametrize("method,every", [('euler', 1), ('rk4', 7)])
+def test_stream_solve_resume(tmp_path, method: str, every: int):
+    y0 = np.array([0.0, 1.0])
+    full = list(main.stream_solve(oscillator, (0.0, 5.0), y0, 100, method, every))
+    checkpoint = str(tmp_path / 'state.npy')
+    stream = main.stream_solve(oscillator, (0.0, 5.0), y0, 100, method, every, checkpoint, checkpoint_every=10)
+    for t, _ in stream:
+        if t > 2.6:
+            break
+    stream.close()
+    resumed = list(main.stream_solve(oscillator, (0.0, 5.0), y0, 100, method, every, checkpoint, checkpoint_every=10, resume=True))
+    assert resumed[0][0] > 0, 'Obliczenia powinny zostać wznowione od punktu kontrolnego.'
+    assert resumed[-1][0] == pytest.approx(full[-1][0]), 'Niepoprawna chwila końcowa.'
+    assert resumed[-1][1] == pytest.approx(full[-1][1], rel=1e-12), 'Wznowione obliczenia dają inny wynik niż nieprzerwane.'
+
+
+def test_euler_inplace():
+    t = np.linspace(0, 1, 51)
+    y0 = np.array([1.0, -3.0])
+    y = main.solve_euler(decay, t, y0)
+    assert np.array_equal(y0, [1.0, -3.0]), 'solve_euler nie powinna nadpisywać y0.'
+    assert main.solve_euler(decay, t, y0, inplace=True) == pytest.approx(y), 'Wariant inplace daje inny wynik.'
+    out = np.empty((51, 2))
+    assert main.solve_euler(decay, t, y0, out=out) is out and out == pytest.approx(y), 'Wynik powinien zostać zapisany w out.'
+
+
+@pytest.mark.parametrize("y0", [np.ones((3, 2)), np.ones((2, 3, 1))])
+def test_initial_state_invalid(y0: np.ndarray):
+    with pytest.raises(ValueError):
+        main._initial_state(y0, 5)
+
+
+def test_initial_state_legacy():
+    y0 = np.zeros((5, 2))
+    y0[0] = [1.0, 2.0]
+    assert main._initial_state(y0, 5) == pytest.approx([1.0, 2.0]), 'Dla tablicy (m, n) warunkiem początkowym jest pierwszy wiersz.'
@@ -0,0 +1,136 @@
+import hashlib
+import numpy as np
+from scipy import sparse
+from typing import List, Tuple
+
+'''
+Funkcje pomocnicze wspólne dla kilku laboratoriów (LAB04, LAB05, LAB07, LAB08, LAB09).
+Moduły main.py importują je stąd, dopisując katalog repozytorium do sys.path.
+'''
+
+
+def residual_norm(A: np.ndarray, x: np.ndarray, b: np.ndarray, chunk_size: int = None):
+    """Funkcja obliczająca normę residuum dla równania postaci:
+    Ax = b
+    Dla stosu k układów wszystkie normy liczone są wspólnym (wsadowym) mnożeniem macierzy,
+    opcjonalnie blokami po chunk_size układów, co ogranicza zużycie pamięci.
+
+      Parameters:
+      A: macierz A (m,n) zawierająca współczynniki równania (gęsta albo scipy.sparse),
+         albo stos macierzy (k,m,n)
+      x: wektor x (n,) zawierający rozwiązania równania albo stos wektorów (k,n)
+      b: wektor b (m,) zawierający współczynniki po prawej stronie równania albo stos wektorów (k,m)
+      chunk_size(int): liczba układów przetwarzanych jednocześnie, domyślnie wszystkie
+
+      Results:
+      (float)- wartość normy residuom dla podanych parametrów
+      (np.ndarray) - wektor (k,) norm residuum dla stosu układów
+                Jeżeli dane wejściowe niepoprawne funkcja zwraca None"""
+    try:
+        if A.ndim == 2 and np.ndim(x) == 1 and np.ndim(b) == 1:
+            rn = np.linalg.norm(b - A @ x)
+            return rn
+        if A.ndim not in (2, 3) or np.ndim(x) != 2 or np.ndim(b) != 2 or len(x) != len(b):
+            raise ValueError
+        if A.ndim == 3 and A.shape[0] != len(x):
+            raise ValueError
+        k = len(x)
+        if chunk_size is None:
+            chunk_size = max(k, 1)
+        if chunk_size < 1:
+            raise ValueError
+        rn = np.empty(k)
+        for start in range(0, k, chunk_size):
+            part = slice(start, start + chunk_size)
+            if A.ndim == 3:
+                Ax = np.matmul(A[part], x[part][..., np.newaxis])[..., 0]
+            else:
+                Ax = (A @ x[part].T).T
+            rn[part] = np.linalg.norm(b[part] - Ax, axis=1)
+        return rn
+    except (ValueError, AttributeError):
+        return None
+
+
+def matrix_fingerprint(A) -> str:
+    """Funkcja zwracająca skrót (blake2b) zawartości macierzy gęstej albo rzadkiej (scipy.sparse),
+    używany jako klucz pamięci podręcznej
+
+        Parameters:
+        A: macierz gęsta albo scipy.sparse
+
+        Results:
+        str: skrót macierzy uwzględniający rodzaj, kształt i typ danych"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((type(A).__name__, A.shape, str(A.dtype))).encode())
+    if sparse.issparse(A):
+        A = sparse.csr_matrix(A)
+        for part in (A.indptr, A.indices, A.data):
+            h.update(np.ascontiguousarray(part).tobytes())
+    else:
+        h.update(np.ascontiguousarray(A).tobytes())
+    return h.hexdigest()
+
+
+def spawn_rngs(n: int, seed=None) -> List[np.random.Generator]:
+    """Funkcja tworząca n niezależnych generatorów liczb losowych z jednego ziarna (SeedSequence.spawn),
+    np. dla procesów roboczych - strumienie są powtarzalne i nie nakładają się
+    Parameters:
+    n(int): liczba generatorów
+    seed: ziarno, np.random.SeedSequence albo None (losowe ziarno)
+    Results:
+    List[np.random.Generator]: lista n generatorów
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return [np.random.default_rng(s) for s in seed.spawn(n)]
+
+
+def random_orthogonal(k: int, m: int, rng) -> np.ndarray:
+    """Funkcja generująca stos k losowych macierzy ortogonalnych (m,m) z rozkładu Haara
+    przez wsadowy rozkład QR macierzy gaussowskich (bez SVD)
+
+        Parameters:
+        k(int): liczba macierzy
+        m(int): rozmiar macierzy
+        rng: generator liczb losowych (np.random.Generator albo np.random.RandomState)
+
+        Results:
+        np.ndarray: stos macierzy ortogonalnych (k,m,m)"""
+    q, r = np.linalg.qr(rng.standard_normal((k, m, m)))
+    # ustalenie znaków przekątnej R, aby rozkład Q był jednostajny (Haar)
+    return q * np.sign(np.diagonal(r, axis1=1, axis2=2))[:, np.newaxis, :]
+
+
+def jacobi_iterations(A, b: np.ndarray, x_init: np.ndarray, epsilon: float = 1e-8,
+                      maxiter: int = 100, check_every: int = 1) -> Tuple[np.ndarray, List[float]]:
+    """Iteracja Jacobiego x_new = x + D^-1 (b - Ax), gdzie przekątna D jest przechowywana jako wektor.
+    Każda iteracja to jedno mnożenie macierz-wektor; działa dla macierzy gęstych i scipy.sparse.
+
+    Parameters:
+    A: macierz współczynników (m,m)
+    b np.ndarray: wektor wartości prawej strony układu (m,)
+    x_init np.ndarray: rozwiązanie początkowe (m,)
+    epsilon float: zadana dokładność normy ||x_new - x||
+    maxiter int: ograniczenie iteracji
+    check_every int: co ile iteracji liczona jest norma ||x_new - x|| (i warunek stopu)
+
+    Returns:
+    np.ndarray: przybliżone rozwiązanie (m,)
+    List[float]: normy ||x_new - x|| z iteracji, w których sprawdzano warunek stopu
+    """
+    if check_every < 1:
+        raise ValueError
+    # przekątna jako wektor, ukształtowana tak jak b (m,) albo (m,1)
+    d = A.diagonal().reshape((-1,) + (1,) * (np.ndim(b) - 1))
+    x = x_init
+    resid = []
+    for i in range(maxiter):
+        x_new = x + (b - A @ x) / d
+        if (i + 1) % check_every == 0 or i == maxiter - 1:
+            r_norm = np.linalg.norm(x_new - x)
+            resid.append(r_norm)
+            if r_norm < epsilon:
+                return x_new, resid
+        x = x_new
+    return x, resid